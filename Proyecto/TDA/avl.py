@@ -1,4 +1,9 @@
+import heapq
+
+
 class AVLNode:
+    __slots__ = ("key", "value", "height", "left", "right")
+
     def __init__(self, key, value=1):
         self.key = key
         self.value = value  # frecuencia
@@ -8,8 +13,15 @@ class AVLNode:
 
 
 class AVLTree:
-    def __init__(self):
+    def __init__(self, track_frequency=True):
         self.root = None
+        self._size = 0
+        # Índice secundario para top_k: frecuencia -> {clave: None}. Subir la
+        # frecuencia de una clave es mover la clave de un balde al siguiente
+        self._by_frequency = {} if track_frequency else None
+
+    def __len__(self):
+        return self._size
 
     # ----- UTILS -----
     def _height(self, node):
@@ -55,33 +67,191 @@ class AVLTree:
 
         return node
 
+    def _retrace(self, stack):
+        # Rebalancea desde el nodo más profundo del camino hacia la raíz. Si
+        # un subárbol queda con la altura que tenía, los ancestros no cambian
+        # y se corta ahí
+        for i in range(len(stack) - 1, -1, -1):
+            node = stack[i]
+            old_height = node.height
+            balanced = self._balance(node)
+            if balanced is not node:
+                if i == 0:
+                    self.root = balanced
+                elif stack[i - 1].left is node:
+                    stack[i - 1].left = balanced
+                else:
+                    stack[i - 1].right = balanced
+            if balanced.height == old_height:
+                return
+
+    def _reindex(self, key, old_value, new_value):
+        buckets = self._by_frequency
+        if buckets is None:
+            return
+        if old_value:
+            bucket = buckets[old_value]
+            del bucket[key]
+            if not bucket:
+                del buckets[old_value]
+        if new_value:
+            buckets.setdefault(new_value, {})[key] = None
+
     # ----- INSERT -----
-    def insert(self, key):
-        self.root = self._insert(self.root, key)
+    def insert(self, key, count=1):
+        node = self.root
+        stack = []
+        while node:
+            if key == node.key:
+                node.value += count  # ya existe, aumenta frecuencia
+                self._reindex(key, node.value - count, node.value)
+                return
+            stack.append(node)
+            node = node.left if key < node.key else node.right
+
+        new = AVLNode(key, count)
+        if not stack:
+            self.root = new
+        elif key < stack[-1].key:
+            stack[-1].left = new
+        else:
+            stack[-1].right = new
+        self._size += 1
+        self._retrace(stack)
+        self._reindex(key, 0, count)
+
+    def bulk_insert(self, keys):
+        """
+        Inserta muchas claves de una vez. Si vienen ordenadas el árbol se
+        construye en O(n); si no, se ordenan primero. Las claves repetidas
+        suman frecuencia igual que en insert.
+        """
+        keys = list(keys)
+        if any(keys[i + 1] < keys[i] for i in range(len(keys) - 1)):
+            keys.sort()
+
+        runs = []
+        for key in keys:
+            if runs and runs[-1][0] == key:
+                runs[-1][1] += 1
+            else:
+                runs.append([key, 1])
+        self.bulk_insert_counts(runs)
+
+    def bulk_insert_counts(self, runs):
+        """
+        Como bulk_insert, con pares [clave, frecuencia] ya ordenados por clave
+        y sin repetir (por ejemplo al cargar un escenario guardado).
+        """
+        runs = [list(run) for run in runs]
+        if self.root:
+            runs = self._merge(list(self.items()), runs)
+
+        self.root = self._build(runs, 0, len(runs))
+        self._size = len(runs)
 
-    def _insert(self, node, key):
+        if self._by_frequency is not None:
+            self._by_frequency = {}
+            for key, value in runs:
+                self._by_frequency.setdefault(value, {})[key] = None
+
+    def _merge(self, a, b):
+        # Mezcla dos listas ordenadas de (clave, frecuencia) sumando repetidas
+        merged = []
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i][0] == b[j][0]:
+                merged.append([a[i][0], a[i][1] + b[j][1]])
+                i += 1
+                j += 1
+            elif a[i][0] < b[j][0]:
+                merged.append(list(a[i]))
+                i += 1
+            else:
+                merged.append(b[j])
+                j += 1
+        merged.extend(list(x) for x in a[i:])
+        merged.extend(b[j:])
+        return merged
+
+    def _build(self, runs, lo, hi):
+        # Árbol perfectamente balanceado a partir de runs[lo:hi] ordenado
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = AVLNode(runs[mid][0], runs[mid][1])
+        node.left = self._build(runs, lo, mid)
+        node.right = self._build(runs, mid + 1, hi)
+        self._update_height(node)
+        return node
+
+    # ----- REMOVE -----
+    def remove(self, key):
+        node = self.root
+        stack = []
+        while node and key != node.key:
+            stack.append(node)
+            node = node.left if key < node.key else node.right
         if not node:
-            return AVLNode(key)
+            return False
+        old_value = node.value
 
-        if key == node.key:
-            node.value += 1  # ya existe, aumenta frecuencia
-        elif key < node.key:
-            node.left = self._insert(node.left, key)
-        else:
-            node.right = self._insert(node.right, key)
+        if node.left and node.right:
+            # Se reemplaza por el sucesor y se elimina el sucesor
+            stack.append(node)
+            succ = node.right
+            while succ.left:
+                stack.append(succ)
+                succ = succ.left
+            node.key, node.value = succ.key, succ.value
+            node = succ
 
-        return self._balance(node)
+        child = node.left or node.right
+        if not stack:
+            self.root = child
+        elif stack[-1].left is node:
+            stack[-1].left = child
+        else:
+            stack[-1].right = child
+        self._size -= 1
+        self._retrace(stack)
+        self._reindex(key, old_value, 0)
+        return True
 
     # ----- GET -----
     def get(self, key):
-        return self._get(self.root, key)
+        node = self.root
+        while node:
+            if key == node.key:
+                return node.value
+            node = node.left if key < node.key else node.right
+        return None
 
-    def _get(self, node, key):
-        if not node:
-            return None
-        if key == node.key:
-            return node.value
-        elif key < node.key:
-            return self._get(node.left, key)
-        else:
-            return self._get(node.right, key)
+    # ----- RECORRIDOS -----
+    def items(self):
+        """Recorrido inorden iterativo: (clave, frecuencia) ordenado por clave."""
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.value
+            node = node.right
+
+    def top_k(self, k):
+        """
+        Las k claves más frecuentes (a igual frecuencia, la menor clave
+        primero). Se recorren los baldes de mayor a menor frecuencia y de
+        cada uno se toman solo las claves que faltan.
+        """
+        result = []
+        if self._by_frequency is None or k <= 0:
+            return result
+        for value in sorted(self._by_frequency, reverse=True):
+            for key in heapq.nsmallest(k - len(result), self._by_frequency[value]):
+                result.append((key, value))
+            if len(result) == k:
+                break
+        return result
@@ -1,49 +1,132 @@
 # tda/hasp_map.py
 
+_EMPTY = -1    # slot nunca usado: corta la secuencia de sondeo
+_DUMMY = -2    # slot liberado por remove: la secuencia de sondeo sigue
+_DELETED = object()  # marca de entrada borrada en los arreglos paralelos
+
+_PERTURB_MASK = (1 << 64) - 1
+
+
 class HashMap:
-    def __init__(self, capacity=100):
-        self._capacity = capacity
-        self._table = [[] for _ in range(capacity)]
+    """
+    Tabla hash con direccionamiento abierto y redimensionamiento automático.
+    Las entradas viven en arreglos paralelos (hash, clave, valor) en orden de
+    inserción; la tabla de índices solo guarda la posición de cada entrada.
+    El hash de cada clave se calcula una vez y se reutiliza al crecer.
+    """
+
+    def __init__(self, capacity=8, load_factor=2 / 3):
+        self._load_factor = load_factor
+        self._hashes = []
+        self._keys = []
+        self._values = []
+        self._size = 0
+        self._reset_index(capacity)
+
+    def _reset_index(self, capacity):
+        size = 8
+        while size < capacity:
+            size <<= 1
+        self._capacity = size
+        self._index = [_EMPTY] * size
+        self._fill = 0  # slots no vacíos (entradas + DUMMY)
+
+    def _lookup(self, key, h):
+        """Devuelve (slot de la clave o -1, primer slot libre para insertarla)."""
+        index, hashes, keys = self._index, self._hashes, self._keys
+        mask = self._capacity - 1
+        i = h & mask
+        # Sondeo con perturbación: usa todos los bits del hash, no solo los bajos
+        perturb = h & _PERTURB_MASK
+        free = -1
+        while True:
+            idx = index[i]
+            if idx == _EMPTY:
+                return -1, (i if free == -1 else free)
+            if idx == _DUMMY:
+                if free == -1:
+                    free = i
+            elif hashes[idx] == h:
+                k = keys[idx]
+                if k is key or k == key:
+                    return i, free
+            perturb >>= 5
+            i = (5 * i + 1 + perturb) & mask
 
-    def _hash(self, key):
-        return hash(key) % self._capacity
+    def _resize(self, capacity):
+        # Compacta las entradas (descarta borradas) y reconstruye los índices
+        live = [i for i, k in enumerate(self._keys) if k is not _DELETED]
+        self._hashes = [self._hashes[i] for i in live]
+        self._keys = [self._keys[i] for i in live]
+        self._values = [self._values[i] for i in live]
+        self._reset_index(capacity)
+
+        index = self._index
+        mask = self._capacity - 1
+        for idx, h in enumerate(self._hashes):
+            i = h & mask
+            perturb = h & _PERTURB_MASK
+            while index[i] != _EMPTY:
+                perturb >>= 5
+                i = (5 * i + 1 + perturb) & mask
+            index[i] = idx
+        self._fill = len(self._keys)
 
     def set(self, key, value):
-        index = self._hash(key)
-        bucket = self._table[index]
+        h = hash(key)
+        slot, free = self._lookup(key, h)
+        if slot != -1:
+            self._values[self._index[slot]] = value
+            return
 
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key, value)
-                return
-        bucket.append((key, value))
+        if self._index[free] == _EMPTY:
+            self._fill += 1
+        self._index[free] = len(self._keys)
+        self._hashes.append(h)
+        self._keys.append(key)
+        self._values.append(value)
+        self._size += 1
 
-    def get(self, key):
-        index = self._hash(key)
-        bucket = self._table[index]
+        if self._fill > self._capacity * self._load_factor:
+            self._resize(self._size * 3)
 
-        for k, v in bucket:
-            if k == key:
-                return v
-        return None
+    def get(self, key):
+        slot, _ = self._lookup(key, hash(key))
+        if slot == -1:
+            return None
+        return self._values[self._index[slot]]
 
     def remove(self, key):
-        index = self._hash(key)
-        bucket = self._table[index]
-        for i, (k, _) in enumerate(bucket):
-            if k == key:
-                del bucket[i]
-                return True
-        return False
+        slot, _ = self._lookup(key, hash(key))
+        if slot == -1:
+            return False
+        idx = self._index[slot]
+        self._index[slot] = _DUMMY
+        self._keys[idx] = _DELETED
+        self._values[idx] = None
+        self._size -= 1
+
+        # Si hay más entradas borradas que vivas, se compacta
+        if len(self._keys) - self._size > self._size:
+            self._resize(self._size * 3)
+        return True
 
     def contains(self, key):
-        return self.get(key) is not None
+        slot, _ = self._lookup(key, hash(key))
+        return slot != -1
 
+    # ----- Iteradores perezosos (orden de inserción) -----
     def keys(self):
-        return [k for bucket in self._table for (k, _) in bucket]
+        return (k for k in self._keys if k is not _DELETED)
 
     def values(self):
-        return [v for bucket in self._table for (_, v) in bucket]
+        return (v for k, v in zip(self._keys, self._values) if k is not _DELETED)
 
     def items(self):
-        return [(k, v) for bucket in self._table for (k, v) in bucket]
+        return ((k, v) for k, v in zip(self._keys, self._values) if k is not _DELETED)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return self.keys()
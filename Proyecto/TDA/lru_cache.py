@@ -0,0 +1,73 @@
+# tda/lru_cache.py
+
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Caché acotada que desaloja la entrada usada hace más tiempo.
+    Con ttl (segundos) las entradas además vencen pasado ese tiempo.
+    Lleva contadores de aciertos, fallos, desalojos y vencimientos.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self._data = OrderedDict()  # clave -> (valor, vence_en)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def remove(self, key):
+        return self._data.pop(key, None) is not None
+
+    def remove_if(self, predicate):
+        """Elimina las entradas cuyo (clave, valor) cumple predicate; devuelve cuántas."""
+        stale = [k for k, (v, _) in self._data.items() if predicate(k, v)]
+        for k in stale:
+            del self._data[k]
+        return len(stale)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
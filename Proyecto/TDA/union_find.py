@@ -0,0 +1,40 @@
+# tda/union_find.py
+
+
+class UnionFind:
+    """
+    Conjuntos disjuntos sobre los enteros 0..n-1, con compresión de caminos
+    y unión por rango: find y union son prácticamente O(1) amortizado.
+    """
+
+    def __init__(self, n):
+        self._parent = list(range(n))
+        self._rank = [0] * n
+        self.components = n
+
+    def find(self, x):
+        parent = self._parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        # Compresión: todo el camino queda apuntando a la raíz
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a, b):
+        """Une los conjuntos de a y b; devuelve False si ya estaban unidos."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        rank = self._rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self._parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+        self.components -= 1
+        return True
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
@@ -3,20 +3,22 @@ import networkx as nx
 import streamlit as st
 
 class AVLVisualizer:
-    def __init__(self, tree):
+    def __init__(self, tree, formatter=None):
         self.tree = tree
         self.graph = nx.DiGraph()
+        # formatter: convierte la clave del nodo (tupla de ids) en texto
+        self.formatter = formatter or (lambda key: " → ".join(map(str, key)))
 
     def _add_edges(self, node):
         if node:
-            label = " → ".join(node.key) + f"\nFreq: {node.value}"
+            label = self.formatter(node.key) + f"\nFreq: {node.value}"
             self.graph.add_node(label)
             if node.left:
-                left_label = " → ".join(node.left.key) + f"\nFreq: {node.left.value}"
+                left_label = self.formatter(node.left.key) + f"\nFreq: {node.left.value}"
                 self.graph.add_edge(label, left_label)
                 self._add_edges(node.left)
             if node.right:
-                right_label = " → ".join(node.right.key) + f"\nFreq: {node.right.value}"
+                right_label = self.formatter(node.right.key) + f"\nFreq: {node.right.value}"
                 self.graph.add_edge(label, right_label)
                 self._add_edges(node.right)
 
@@ -16,11 +16,10 @@ def guardar_graficos_pdf(graph, sim):
 
     # === Pie Chart: Distribución de nodos ===
     roles = {"📦": "Storage", "🔋": "Recharge", "👤": "Clients"}
-    role_counts = {k: 0 for k in roles}
-    for v in graph.vertices():
-        for symbol in roles:
-            if str(v).startswith(symbol):
-                role_counts[symbol] += 1
+    simbolos = {"📦": "almacen", "🔋": "recarga", "👤": "cliente"}
+    # Conteos y top de visitas precalculados por sim.analytics
+    conteo_roles = sim.analytics.role_counts()
+    role_counts = {symbol: conteo_roles.get(role, 0) for symbol, role in simbolos.items()}
 
     labels = [roles[k] for k in role_counts]
     sizes = [role_counts[k] for k in role_counts]
@@ -33,20 +32,6 @@ def guardar_graficos_pdf(graph, sim):
     plt.close()
 
     # === Barras: Nodos más visitados por tipo ===
-    visit_counts = {"📦": {}, "🔋": {}, "👤": {}}
-    for v in graph.vertices():
-        name = str(v)
-        for symbol in visit_counts:
-            if name.startswith(symbol):
-                visit_counts[symbol][name] = 0
-
-    for order in sim.get_orders():
-        for node in order.get("path", []):
-            node_str = str(node)
-            for symbol in visit_counts:
-                if node_str in visit_counts[symbol]:
-                    visit_counts[symbol][node_str] += 1
-
     tipos_info = {
         "👤": ("temp/top_visited_clients.png", "Top Visited Clients"),
         "🔋": ("temp/top_visited_recharges.png", "Top Visited Recharge Stations"),
@@ -54,7 +39,7 @@ def guardar_graficos_pdf(graph, sim):
     }
 
     for tipo, (filename, title) in tipos_info.items():
-        sorted_visits = sorted(visit_counts[tipo].items(), key=lambda x: x[1], reverse=True)[:5]
+        sorted_visits = [(str(v), c) for v, c in sim.analytics.top_visited(simbolos[tipo], 5)]
         if sorted_visits:
             nodos = [n[0] for n in sorted_visits]
             visitas = [n[1] for n in sorted_visits]
@@ -70,7 +55,7 @@ def guardar_graficos_pdf(graph, sim):
 
 
 
-def generar_pdf(orders, clients, rutas):
+def generar_pdf(orders, clients, rutas, total_rutas=None):
     # Crear carpeta temporal si no existe
     os.makedirs("temp", exist_ok=True)
     ruta_salida = "temp/informe_drones.pdf"
@@ -91,7 +76,7 @@ def generar_pdf(orders, clients, rutas):
     y -= 20
     c.drawString(50, y, f"Total Clientes registrados: {len(clients)}")
     y -= 20
-    c.drawString(50, y, f"Total Rutas únicas usadas: {len(rutas)}")
+    c.drawString(50, y, f"Total Rutas únicas usadas: {len(rutas) if total_rutas is None else total_rutas}")
     y -= 30
 
     # Sección: Clientes
@@ -123,7 +108,7 @@ def generar_pdf(orders, clients, rutas):
             order.get("order_id"),
             order.get("origin"),
             order.get("destination"),
-            order.get("cost"),
+            order.get("route_cost"),
             "✔️" if order.get("delivered_at") else "❌"
         ])
 
@@ -5,6 +5,8 @@ import matplotlib.patches as mpatches
 import networkx as nx
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from visual.nx_snapshot import nx_snapshot
+
 try:
     import streamlit as st
 except ModuleNotFoundError:
@@ -22,33 +24,11 @@ class NetworkXAdapter:
     def __init__(self, grafo_personalizado, seed: int = 42):
         self.graph_obj = grafo_personalizado
         self.seed = seed
-        self._nxgraph = nx.DiGraph() if grafo_personalizado.is_directed() else nx.Graph()
-        self._labels = {}
-        self._construir()
-
-    def _extraer_etiqueta(self, nodo) -> str:
-        e = nodo.element()
-        return getattr(e, "label", str(e))
-
-    def _rol_nodo(self, nodo) -> Optional[str]:
-        e = nodo.element()
-        return getattr(e, "role", None)
-
-    def _construir(self):
-        for nodo in self.graph_obj.vertices():
-            etiqueta = self._extraer_etiqueta(nodo)
-            rol = self._rol_nodo(nodo)
-            self._labels[nodo] = etiqueta
-            self._nxgraph.add_node(nodo, label=etiqueta, role=rol)
-
-        for arista in self.graph_obj.edges():
-            origen, destino = arista.endpoints()
-            peso = arista.element()
-            self._nxgraph.add_edge(origen, destino, weight=peso)
+        self._nxgraph = nx_snapshot(grafo_personalizado).grafo
 
     def recargar(self):
-        self._nxgraph.clear()
-        self._construir()
+        # La copia compartida se actualiza sola con cada mutación del grafo
+        self._nxgraph = nx_snapshot(self.graph_obj).grafo
 
     def _calcular_posiciones(self) -> Dict[Any, Tuple[float, float]]:
         return nx.spring_layout(self._nxgraph, seed=self.seed)
@@ -83,7 +63,7 @@ class NetworkXAdapter:
             self._nxgraph,
             pos,
             ax=ax,
-            labels={n: self._labels[n] for n in self._nxgraph.nodes()},
+            labels=dict(self._nxgraph.nodes(data="label")),
             node_color=colores_nodos,
             edge_color=colores_aristas,
             node_size=950,
@@ -0,0 +1,4 @@
+# conftest.py
+#
+# pytest agrega esta carpeta a sys.path, así los tests importan los paquetes
+# (model, simulacion, TDA, ...) igual que la app. Uso: python -m pytest tests
@@ -1,6 +1,8 @@
 # domain/client.py
 
 class Client:
+    __slots__ = ("client_id", "name", "client_type", "orders")
+
     def __init__(self, client_id, name, client_type="premium"):
         self.client_id = client_id
         self.name = name
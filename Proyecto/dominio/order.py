@@ -1,22 +1,71 @@
 # domain/order.py
+import time
 from datetime import datetime
+from enum import Enum
+
+
+class OrderStatus(str, Enum):
+    """Estado de una orden; compara y hashea igual que su texto ("pending", ...)."""
+
+    PENDING = "pending"
+    IN_TRANSIT = "in_transit"
+    DELIVERED = "delivered"
+
+    __hash__ = str.__hash__
+
+    def __str__(self):
+        return self.value
+
 
 class Order:
-    def __init__(self, order_id, client_id, origin, destination, priority=1, path=None):
+    """
+    Orden de entrega. Usa __slots__ y fechas como segundos epoch (float)
+    para que una simulación larga pueda tener millones en memoria. Con una
+    RouteTable la ruta se guarda como la tupla de ids internada (compartida
+    con las demás órdenes de la misma ruta) y path la traduce a vértices.
+    """
+
+    __slots__ = ("order_id", "client_id", "origin", "destination", "priority",
+                 "created_at", "delivered_at", "status", "total_cost", "path_key", "route_table")
+
+    def __init__(self, order_id, client_id, origin, destination, priority=1, path=None,
+                 created_at=None, route_table=None):
         self.order_id = order_id
         self.client_id = client_id
         self.origin = origin
         self.destination = destination
         self.priority = priority
-        self.created_at = datetime.now()
+        self.created_at = created_at if created_at is not None else time.time()
         self.delivered_at = None
-        self.status = "pending"
+        self.status = OrderStatus.PENDING
         self.total_cost = 0
-        self.path = path or []
+        self.route_table = route_table
+        if path:
+            self.path = path
+        else:
+            self.path_key = ()
+
+    @property
+    def path(self):
+        if self.route_table is not None:
+            return self.route_table.path(self.path_key)
+        return list(self.path_key)
+
+    @path.setter
+    def path(self, path):
+        # Con tabla: tupla de ids internada; sin ella, tupla de vértices
+        if self.route_table is not None:
+            self.path_key = self.route_table.intern(path)
+        else:
+            self.path_key = tuple(path)
+
+    def start_delivery(self):
+        self.status = OrderStatus.IN_TRANSIT
 
-    def complete_delivery(self, cost):
-        self.status = "delivered"
-        self.delivered_at = datetime.now()
+    def complete_delivery(self, cost, delivered_at=None):
+        # delivered_at: fecha simulada de entrega (epoch); sin ella se usa la actual
+        self.status = OrderStatus.DELIVERED
+        self.delivered_at = delivered_at if delivered_at is not None else time.time()
         self.total_cost = cost
 
     def to_dict(self):
@@ -27,19 +76,19 @@ class Order:
             "origin": str(self.origin),
             "destination": str(self.destination),
             "priority": self.priority,
-            "status": self.status,
-            "created_at": self.created_at.isoformat(),
-            "delivered_at": self.delivered_at.isoformat() if self.delivered_at else None,
+            "status": self.status.value,
+            "created_at": _iso(self.created_at),
+            "delivered_at": _iso(self.delivered_at),
             "route_cost": self.total_cost,
             "path": [str(p) for p in self.path]  # ✅ Manteniendo el path original
         }
 
-    
-
-    
-
     def __str__(self):
         return f"Orden({self.order_id}) para cliente {self.client_id}"
 
     def __repr__(self):
         return str(self)
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
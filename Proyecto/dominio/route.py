@@ -1,6 +1,8 @@
 # domain/route.py
 
 class Route:
+    __slots__ = ("path", "cost")
+
     def __init__(self, path, cost):
         """
         path: lista de nodos recorridos (por ejemplo: [V1, V2, V3])
@@ -29,3 +31,63 @@ class Route:
     def __repr__(self):
         return str(self)
 
+
+class RouteTable:
+    """
+    Tabla de internado de rutas: cada vértice recibe un id entero pequeño y
+    cada ruta distinta se guarda una sola vez como tupla de esos ids.
+    Las etiquetas de texto solo se generan al mostrar la ruta.
+    """
+
+    def __init__(self):
+        self._vertex_ids = {}  # Vertex -> id
+        self._vertices = []    # id -> Vertex
+        self._route_ids = {}   # tupla de ids -> id de ruta
+        self._routes = []      # id de ruta -> tupla de ids
+
+    def vertex_id(self, v):
+        vid = self._vertex_ids.get(v)
+        if vid is None:
+            vid = len(self._vertices)
+            self._vertex_ids[v] = vid
+            self._vertices.append(v)
+        return vid
+
+    def vertex(self, vid):
+        return self._vertices[vid]
+
+    def num_vertices(self):
+        return len(self._vertices)
+
+    def vertex_labels(self):
+        """Etiqueta de cada vértice, en orden de id."""
+        return [str(v) for v in self._vertices]
+
+    def intern(self, path):
+        """Devuelve la tupla canónica de ids de la ruta (compartida entre órdenes)."""
+        return self.intern_ids(tuple(self.vertex_id(v) for v in path))
+
+    def intern_ids(self, key):
+        """Como intern, con la tupla de ids de vértice ya armada."""
+        rid = self._route_ids.get(key)
+        if rid is None:
+            self._route_ids[key] = len(self._routes)
+            self._routes.append(key)
+            return key
+        return self._routes[rid]
+
+    def route_id(self, key):
+        return self._route_ids.get(key)
+
+    def route(self, rid):
+        return self._routes[rid]
+
+    def path(self, key):
+        return [self._vertices[vid] for vid in key]
+
+    def label(self, key):
+        """Texto de la ruta: A → B → C"""
+        return " → ".join(str(self._vertices[vid]) for vid in key)
+
+    def __len__(self):
+        return len(self._routes)
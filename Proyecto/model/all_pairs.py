@@ -0,0 +1,91 @@
+# model/all_pairs.py
+
+import weakref
+
+import numpy as np
+
+from model.dynamic_paths import pending_changes, repair_matrix
+
+
+class AllPairsShortestPaths:
+    """
+    Matrices de distancias y predecesores (Floyd-Warshall) de una versión del grafo.
+    dist[i, j]: costo mínimo de i a j (inf si no hay camino).
+    pred[i, j]: índice del vértice anterior a j en la ruta desde i (-1 si no hay).
+    """
+
+    def __init__(self, graph):
+        csr = graph.freeze()
+        self.version = csr.version
+        self.vertices = csr.vertices
+        self.index = csr.index
+        self.dist, self.pred = self._floyd_warshall(csr)
+
+    def _floyd_warshall(self, csr):
+        n = csr.num_vertices()
+        dist = np.full((n, n), np.inf)
+        pred = np.full((n, n), -1, dtype=np.int32)
+
+        # Aristas directas leídas de los arreglos CSR
+        rows = csr.sources()
+        dist[rows, csr.indices] = csr.weights
+        pred[rows, csr.indices] = rows
+
+        np.fill_diagonal(dist, 0)
+
+        # Relajación vectorizada: una pasada por vértice intermedio k
+        for k in range(n):
+            cand = dist[:, k, None] + dist[None, k, :]
+            mejor = cand < dist
+            np.minimum(dist, cand, out=dist)
+            pred = np.where(mejor, pred[None, k, :], pred)
+
+        return dist, pred
+
+    def sync(self, csr):
+        """Aplica los cambios de peso registrados en csr desde self.version."""
+        changes = pending_changes(csr, self.version)
+        repaired = repair_matrix(csr, self.dist, self.pred, changes) if changes else 0
+        self.version = csr.version
+        return repaired
+
+    def distance(self, u, v):
+        return float(self.dist[self.index[u], self.index[v]])
+
+    def path(self, u, v):
+        """Reconstruye la ruta u -> v leyendo la matriz de predecesores."""
+        i, j = self.index[u], self.index[v]
+        if i != j and self.pred[i, j] < 0:
+            return None
+        path = [j]
+        while j != i:
+            j = self.pred[i, j]
+            path.append(j)
+        path.reverse()
+        return [self.vertices[k] for k in path]
+
+    def route(self, u, v):
+        """(path, cost) o (None, None) si v no es alcanzable desde u."""
+        path = self.path(u, v)
+        if path is None:
+            return None, None
+        return path, self.distance(u, v)
+
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def all_pairs(graph):
+    """
+    Devuelve las matrices del grafo (Graph o CSRGraph). Se guardan por
+    instantánea CSR, que solo cambia con cambios de estructura; si solo
+    cambiaron pesos (Graph.update_edge_weight) las matrices se reparan.
+    """
+    csr = graph.freeze()
+    apsp = _cache.get(csr)
+    if apsp is None:
+        apsp = AllPairsShortestPaths(csr)
+        _cache[csr] = apsp
+    elif apsp.version != csr.version:
+        apsp.sync(csr)
+    return apsp
@@ -0,0 +1,83 @@
+# model/assignment.py
+
+import weakref
+
+from model.dynamic_paths import pending_changes, repair_tree
+from model.shortest_path import INF, multi_source_dijkstra, reconstruct_path
+
+
+class NearestWarehouse:
+    """
+    Almacén más cercano (por costo de ruta) a cada vértice de una versión del
+    grafo, calculado con un único Dijkstra multi-origen desde todos los
+    vértices de rol "almacen". Consultar la asignación de un vértice es O(1).
+    """
+
+    def __init__(self, graph, role="almacen"):
+        csr = graph.freeze()
+        self.version = csr.version
+        self.vertices = csr.vertices
+        self.index = csr.index
+        sources = [csr.index[v] for v in _by_role(graph, role)]
+        self.dist, self.pred, self.origin = multi_source_dijkstra(csr, sources)
+
+    def sync(self, csr):
+        """Repara el árbol multi-origen con los cambios de peso de csr."""
+        changes = pending_changes(csr, self.version)
+        if changes:
+            repair_tree(csr, self.dist, self.pred, changes, origin=self.origin)
+        self.version = csr.version
+
+    def warehouse(self, v):
+        """Almacén asignado a v, o None si ninguno lo alcanza."""
+        o = self.origin[self.index[v]]
+        return self.vertices[o] if o != -1 else None
+
+    def cost(self, v):
+        return self.dist[self.index[v]]
+
+    def route(self, v):
+        """(path desde el almacén hasta v, cost) o (None, None)."""
+        i = self.index[v]
+        if self.dist[i] == INF:
+            return None, None
+        return [self.vertices[k] for k in reconstruct_path(self.pred, i)], self.dist[i]
+
+    def route_ids(self, i):
+        """Como route, sobre ids de la instantánea CSR."""
+        if self.dist[i] == INF:
+            return None, None
+        return reconstruct_path(self.pred, i), self.dist[i]
+
+    def assignments(self, role="cliente"):
+        """[(vértice, almacén, cost), ...] para los vértices de ese rol."""
+        return [
+            (v, self.warehouse(v), self.dist[i])
+            for i, v in enumerate(self.vertices)
+            if getattr(v.element(), "role", None) == role
+        ]
+
+
+def _by_role(graph, role):
+    # Índice de roles del Graph; una instantánea CSR suelta no lo tiene
+    if hasattr(graph, "vertices_by_role"):
+        return graph.vertices_by_role(role)
+    return [v for v in graph.vertices if getattr(v.element(), "role", None) == role]
+
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def nearest_warehouse(graph):
+    """
+    Asignación de almacenes del grafo (Graph o CSRGraph), guardada por
+    instantánea CSR igual que all_pairs (y reparada igual si cambian pesos).
+    """
+    csr = graph.freeze()
+    result = _cache.get(csr)
+    if result is None:
+        result = NearestWarehouse(graph)
+        _cache[csr] = result
+    elif result.version != csr.version:
+        result.sync(csr)
+    return result
@@ -0,0 +1,126 @@
+# model/csr.py
+
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Instantánea de solo lectura de un Graph en formato CSR (compressed sparse row).
+    Cada vértice recibe un id entero 0..n-1; las aristas salientes de i son
+    indices[indptr[i]:indptr[i + 1]] con sus pesos en weights.
+    Se obtiene con Graph.freeze() y acepta las mismas consultas de ruteo que Graph.
+    """
+
+    def __init__(self, graph=None):
+        if graph is None:
+            return  # construida por from_arrays
+        self.version = graph.version()
+        self.directed = graph.is_directed()
+        self.vertices = list(graph.vertices())
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+
+        indptr = [0]
+        indices = []
+        weights = []
+        for v in self.vertices:
+            for e in graph.incident_edges(v):
+                indices.append(self.index[e.opposite(v)])
+                weights.append(e.element())
+            indptr.append(len(indices))
+
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int32)
+        # dtype inferido: pesos enteros siguen siendo enteros
+        self.weights = np.array(weights) if weights else np.zeros(0)
+        self.weight_log = []  # (versión, i, j, peso anterior, peso nuevo)
+        self._lists = None
+        self._reverse = None
+
+    @classmethod
+    def from_arrays(cls, indptr, indices, weights, directed=True, vertices=None, version=0):
+        """
+        Arma la instantánea directamente desde los arreglos (por ejemplo en un
+        proceso worker o al cargar desde disco). Sin vertices, los ids enteros
+        hacen de vértices.
+        """
+        csr = cls()
+        csr.version = version
+        csr.directed = directed
+        csr.indptr = np.asarray(indptr)
+        csr.indices = np.asarray(indices)
+        csr.weights = np.asarray(weights)
+        csr.vertices = list(vertices) if vertices is not None else list(range(len(csr.indptr) - 1))
+        csr.index = {v: i for i, v in enumerate(csr.vertices)}
+        csr.weight_log = []
+        csr._lists = None
+        csr._reverse = None
+        return csr
+
+    def freeze(self):
+        """Una instantánea ya está congelada: permite pasar Graph o CSRGraph."""
+        return self
+
+    def num_vertices(self):
+        return len(self.vertices)
+
+    def num_edges(self):
+        return len(self.indices)
+
+    def lists(self):
+        """indptr/indices/weights como listas de Python para bucles puros (más rápidos)."""
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(), self.indices.tolist(), self.weights.tolist())
+        return self._lists
+
+    def set_weight(self, i, j, w, version):
+        """
+        Cambia en el lugar el peso de la arista i -> j (y j -> i si el grafo no
+        es dirigido) y deja la instantánea en la versión indicada. Cada cambio
+        queda en weight_log para que las estructuras derivadas de esta
+        instantánea se reparen en vez de recalcularse.
+        """
+        pares = ((i, j),) if self.directed else ((i, j), (j, i))
+        for a, b in pares:
+            old = self._set_entry(a, b, w)
+            if self._reverse is not None and self._reverse is not self:
+                self._reverse._set_entry(b, a, w)
+            self.weight_log.append((version, a, b, old, w))
+        self.version = version
+        if self._reverse is not None:
+            self._reverse.version = version
+
+    def _set_entry(self, a, b, w):
+        start = self.indptr[a]
+        k = start + int(np.flatnonzero(self.indices[start:self.indptr[a + 1]] == b)[0])
+        if self.weights.dtype.kind in "iu" and w != int(w):
+            # Un peso fraccionario en un arreglo entero se truncaría
+            self.weights = self.weights.astype(np.float64)
+        old = self.weights[k].item()
+        self.weights[k] = w
+        if self._lists is not None:
+            self._lists[2][k] = w
+        return old
+
+    def sources(self):
+        """Vértice de origen de cada arista (arreglo paralelo a indices)."""
+        return np.repeat(np.arange(len(self.vertices), dtype=np.int32), np.diff(self.indptr))
+
+    def reverse(self):
+        """CSR con las aristas invertidas (aristas entrantes de cada vértice)."""
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            n = len(self.vertices)
+            order = np.argsort(self.indices, kind="stable")
+            rev = CSRGraph.from_arrays(
+                np.concatenate(([0], np.cumsum(np.bincount(self.indices, minlength=n)))),
+                self.sources()[order],
+                self.weights[order],
+                directed=True,
+                version=self.version,
+            )
+            rev.vertices = self.vertices
+            rev.index = self.index
+            rev._reverse = self
+            self._reverse = rev
+        return self._reverse
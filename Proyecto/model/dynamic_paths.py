@@ -0,0 +1,123 @@
+# model/dynamic_paths.py
+#
+# Reparación incremental de caminos mínimos cuando cambian pesos de aristas
+# (al estilo Ramalingam-Reps). Los cambios se leen de CSRGraph.weight_log y
+# se aplican juntos; los arreglos CSR ya tienen los pesos nuevos.
+
+import heapq
+
+import numpy as np
+
+from model.shortest_path import INF, dijkstra
+
+
+def pending_changes(csr, since):
+    """
+    Cambios netos de peso registrados en csr después de la versión since:
+    {(i, j): (peso anterior, peso nuevo)}, sin los que volvieron a su valor.
+    """
+    net = {}
+    for version, i, j, old, new in csr.weight_log:
+        if version > since:
+            first = net.get((i, j), (old, new))[0]
+            net[(i, j)] = (first, new)
+    return {arc: (old, new) for arc, (old, new) in net.items() if old != new}
+
+
+def repair_tree(csr, dist, pred, changes, origin=None):
+    """
+    Repara en el lugar un árbol de caminos mínimos (dist, pred y, si es
+    multi-origen, origin) tras los cambios {(i, j): (old, new)}.
+    Aumentos: solo se recalcula el subárbol que colgaba de una arista que
+    subió, partiendo de sus vecinos entrantes no afectados. Bajas: se
+    propaga desde el extremo que mejoró. Devuelve cuántos vértices tocó.
+    """
+    indptr, indices, weights = csr.lists()
+    n = len(dist)
+    heap = []
+
+    # Subárboles que colgaban de aristas que subieron de peso
+    raices = [j for (i, j), (old, new) in changes.items() if new > old and pred[j] == i]
+    afectados = set()
+    if raices:
+        children = [[] for _ in range(n)]
+        for v, p in enumerate(pred):
+            if p != -1:
+                children[p].append(v)
+        stack = raices
+        while stack:
+            v = stack.pop()
+            if v not in afectados:
+                afectados.add(v)
+                stack.extend(children[v])
+        for v in afectados:
+            dist[v] = INF
+            pred[v] = -1
+        rindptr, rindices, rweights = csr.reverse().lists()
+        for v in afectados:
+            for k in range(rindptr[v], rindptr[v + 1]):
+                u = rindices[k]
+                nd = dist[u] + rweights[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+            if dist[v] < INF:
+                heapq.heappush(heap, (dist[v], v))
+
+    # Aristas que bajaron de peso
+    for (i, j), (old, new) in changes.items():
+        if new < old and dist[i] + new < dist[j]:
+            dist[j] = dist[i] + new
+            pred[j] = i
+            heapq.heappush(heap, (dist[j], j))
+
+    tocados = set(afectados)
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        tocados.add(u)
+        if origin is not None:
+            origin[u] = origin[pred[u]]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    if origin is not None:
+        for v in afectados:
+            if dist[v] == INF:
+                origin[v] = -1
+    return len(tocados)
+
+
+def repair_matrix(csr, dist, pred, changes):
+    """
+    Repara en el lugar las matrices de distancias y predecesores de
+    Floyd-Warshall. Aumentos: se recalculan con Dijkstra solo las filas s
+    cuya ruta usaba la arista (pred[s, j] == i). Bajas: dist = min(dist,
+    dist[:, i] + w + dist[j, :]) en una operación vectorizada por arista.
+    Devuelve cuántas filas se recalcularon.
+    """
+    filas = set()
+    for (i, j), (old, new) in changes.items():
+        if new > old:
+            filas.update(np.flatnonzero(pred[:, j] == i).tolist())
+    for s in filas:
+        d, p = dijkstra(csr, s)
+        dist[s] = d
+        pred[s] = p
+
+    for (i, j), (old, new) in changes.items():
+        if new < old:
+            cand = dist[:, i, None] + new + dist[None, j, :]
+            mejor = cand < dist
+            if mejor.any():
+                via = np.broadcast_to(pred[j], dist.shape).copy()
+                via[:, j] = i
+                dist[mejor] = cand[mejor]
+                pred[mejor] = via[mejor]
+    return len(filas)
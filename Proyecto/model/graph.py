@@ -1,41 +1,187 @@
+import numpy as np
+
 from .vertex import Vertex
 from .edge import Edge
+from .csr import CSRGraph
+from .spatial import distancia_km
+
+
+def _group(vertices, keys, others, edges):
+    # {vértice: {vecino: arista}}; keys viene ordenado (orden estable), así
+    # cada fila es un tramo contiguo y cada vecino queda en su orden original
+    bounds = np.searchsorted(keys, np.arange(len(vertices) + 1)).tolist()
+    return {v: dict(zip(others[bounds[i]:bounds[i + 1]], edges[bounds[i]:bounds[i + 1]]))
+            for i, v in enumerate(vertices)}
+
 
 class Graph:
     def __init__(self, directed=False):
         self._outgoing = {}
         self._incoming = {} if directed else self._outgoing
         self._directed = directed
+        self._version = 0  # contador de mutaciones: invalida cálculos cacheados
+        self._observers = []
+        self._frozen = None  # instantánea CSR, se reconstruye si quedó desactualizada
+        self._by_role = {}  # rol del elemento -> {vertex: None}, en orden de inserción
+
+    @classmethod
+    def from_edges(cls, elements, sources, targets, weights, directed=False):
+        """
+        Grafo armado de una vez para redes grandes: elements son los elementos
+        de los vértices y sources / targets / weights son arreglos paralelos
+        con las aristas (posiciones en elements y peso). Las aristas se agrupan
+        por vértice con numpy en vez de pasar una a una por insert_edge; el
+        orden de los vecinos es el mismo que darían esas inserciones.
+        """
+        graph = cls(directed=directed)
+        vertices = [Vertex(x) for x in elements]
+        for v, x in zip(vertices, elements):
+            graph._by_role.setdefault(getattr(x, "role", None), {})[v] = None
+
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights)
+        m = len(sources)
+
+        if directed:
+            # Aristas ordenadas por origen antes de crear objetos: cada fila
+            # se arma de un tramo contiguo, sin saltos por la memoria
+            order = np.argsort(sources, kind="stable")
+            sources, targets, weights = sources[order], targets[order], weights[order]
+            heads = [vertices[j] for j in targets.tolist()]
+            edges = [Edge(vertices[i], v, w) for i, v, w in zip(sources.tolist(), heads, weights.tolist())]
+            graph._outgoing = _group(vertices, sources, heads, edges)
+            graph._incoming = None  # se arma desde _outgoing recién cuando se usa
+        else:
+            edges = [Edge(vertices[i], vertices[j], w)
+                     for i, j, w in zip(sources.tolist(), targets.tolist(), weights.tolist())]
+            # Cada arista aparece en las filas de sus dos extremos, intercaladas
+            # para conservar el orden de inserción
+            keys = np.column_stack((sources, targets)).ravel()
+            others = np.column_stack((targets, sources)).ravel()
+            order = np.argsort(keys, kind="stable")
+            graph._outgoing = graph._incoming = _group(
+                vertices, keys[order], [vertices[j] for j in others[order].tolist()],
+                [edges[k] for k in (order // 2).tolist()])
+        graph._version = len(vertices) + m
+        return graph
+
+    def version(self):
+        return self._version
+
+    def freeze(self):
+        """
+        Instantánea CSR (ids enteros y arreglos numpy) para consultas de solo
+        lectura. Las mutaciones siguen usando los diccionarios; la instantánea
+        se reconstruye de forma perezosa solo cuando cambió la versión.
+        """
+        if self._frozen is None or self._frozen.version != self._version:
+            self._frozen = CSRGraph(self)
+        return self._frozen
+
+    def add_observer(self, observer):
+        """
+        Registra un objeto que se mantiene sincronizado con el grafo.
+        Puede definir vertex_inserted(graph, v), vertex_removed(graph, v),
+        edge_inserted(graph, e), edge_removed(graph, e) y
+        edge_weight_updated(graph, e, old).
+        """
+        self._observers.append(observer)
+
+    def remove_observer(self, observer):
+        self._observers.remove(observer)
+
+    def has_observer(self, observer):
+        return observer in self._observers
+
+    def _notify(self, event, *args):
+        for observer in self._observers:
+            handler = getattr(observer, event, None)
+            if handler:
+                handler(self, *args)
 
     def is_directed(self):
         return self._directed
 
+    def _incoming_map(self):
+        # Aristas entrantes por vértice; un grafo armado con from_edges las
+        # indexa recién aquí, ya que la carga y el ruteo solo usan las salientes
+        if self._incoming is None:
+            incoming = self._incoming = {v: {} for v in self._outgoing}
+            for u, row in self._outgoing.items():
+                for v, e in row.items():
+                    incoming[v][u] = e
+        return self._incoming
+
     def insert_vertex(self, element):
         v = Vertex(element)
         self._outgoing[v] = {}
         if self._directed:
-            self._incoming[v] = {}
+            self._incoming_map()[v] = {}
+        self._by_role.setdefault(getattr(element, "role", None), {})[v] = None
+        self._version += 1
+        if self._observers:
+            self._notify("vertex_inserted", v)
         return v
 
     def insert_edge(self, u, v, element):
         e = Edge(u, v, element)
         self._outgoing[u][v] = e
-        self._incoming[v][u] = e
+        self._incoming_map()[v][u] = e
+        self._version += 1
+        if self._observers:
+            self._notify("edge_inserted", e)
+        return e
+
+    def update_edge_weight(self, u, v, w):
+        """
+        Cambia el peso de la arista u -> v sin reemplazarla. Si la instantánea
+        CSR está al día se corrige en el lugar (mismos ids), y los observadores
+        reciben el peso anterior para reparar solo lo afectado.
+        Entre vértices con coordenadas el peso no puede bajar de la distancia
+        en línea recta: A* usa esa distancia como cota inferior.
+        """
+        e = self.get_edge(u, v)
+        if e is None:
+            raise ValueError(f"No existe la arista {u} -> {v}")
+        minimo = distancia_km(u, v)
+        if w < minimo:
+            raise ValueError(f"El peso de {u} -> {v} no puede ser menor que su distancia en línea recta "
+                             f"({minimo:.2f} km)")
+        old = e._element
+        if old == w:
+            return e
+        e._element = w
+        frozen = self._frozen
+        vigente = frozen is not None and frozen.version == self._version
+        self._version += 1
+        if vigente:
+            frozen.set_weight(frozen.index[u], frozen.index[v], w, self._version)
+        if self._observers:
+            self._notify("edge_weight_updated", e, old)
         return e
 
     def remove_edge(self, u, v):
         if u in self._outgoing and v in self._outgoing[u]:
-            del self._outgoing[u][v]
-            del self._incoming[v][u]
+            incoming = self._incoming_map()  # antes del pop, si recién se arma
+            e = self._outgoing[u].pop(v)
+            del incoming[v][u]
+            self._version += 1
+            if self._observers:
+                self._notify("edge_removed", e)
 
     def remove_vertex(self, v):
         for u in list(self._outgoing.get(v, {})):
             self.remove_edge(v, u)
-        for u in list(self._incoming.get(v, {})):
+        for u in list(self._incoming_map().get(v, {})):
             self.remove_edge(u, v)
-        self._outgoing.pop(v, None)
         if self._directed:
-            self._incoming.pop(v, None)
+            self._incoming_map().pop(v, None)
+        if self._outgoing.pop(v, None) is not None:
+            self._by_role.get(getattr(v.element(), "role", None), {}).pop(v, None)
+            self._version += 1
+            if self._observers:
+                self._notify("vertex_removed", v)
 
     def get_edge(self, u, v):
         return self._outgoing.get(u, {}).get(v)
@@ -43,6 +189,13 @@ class Graph:
     def vertices(self):
         return self._outgoing.keys()
 
+    def vertices_by_role(self, role):
+        """Vértices cuyo elemento tiene ese rol (almacen, recarga, cliente), sin recorrer el grafo."""
+        return self._by_role.get(role, {}).keys()
+
+    def role_counts(self):
+        return {role: len(vs) for role, vs in self._by_role.items() if vs}
+
     def edges(self):
         seen = set()
         for map in self._outgoing.values():
@@ -53,9 +206,9 @@ class Graph:
         return self._outgoing[v].keys()
 
     def degree(self, v, outgoing=True):
-        adj = self._outgoing if outgoing else self._incoming
+        adj = self._outgoing if outgoing else self._incoming_map()
         return len(adj[v])
 
     def incident_edges(self, v, outgoing=True):
-        adj = self._outgoing if outgoing else self._incoming
+        adj = self._outgoing if outgoing else self._incoming_map()
         return adj[v].values()
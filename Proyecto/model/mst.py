@@ -0,0 +1,251 @@
+# model/mst.py
+#
+# Árbol (bosque) de expansión mínima de la versión no dirigida del grafo:
+# el par {u, v} pesa lo mismo que la más liviana de sus aristas u->v y v->u.
+
+import bisect
+import itertools
+import weakref
+from collections import deque
+
+from TDA.union_find import UnionFind
+
+
+def kruskal(graph):
+    """
+    Kruskal con union-find sobre la instantánea CSR del grafo (Graph o
+    CSRGraph). Devuelve [(u, v, peso), ...] con los vértices del grafo.
+    """
+    csr = graph.freeze()
+    pares = {}
+    for u, v, w in zip(csr.sources().tolist(), csr.indices.tolist(), csr.weights.tolist()):
+        if u == v:
+            continue
+        key = (u, v) if u < v else (v, u)
+        if key not in pares or w < pares[key]:
+            pares[key] = w
+
+    uf = UnionFind(csr.num_vertices())
+    tree = []
+    n_max = csr.num_vertices() - 1
+    for (u, v), w in sorted(pares.items(), key=lambda item: item[1]):
+        if uf.union(u, v):
+            tree.append((csr.vertices[u], csr.vertices[v], w))
+            if len(tree) == n_max:
+                break
+    return tree
+
+
+class DynamicMST:
+    """
+    Bosque de expansión mínima que se mantiene al día como observador del
+    grafo. Al aparecer un par más liviano se busca el ciclo que forma en el
+    árbol y sale su arista más pesada; al quitar una arista del árbol se
+    reconecta con la más liviana del conjunto ordenado de aristas fuera del
+    árbol que cruce el corte. El armado inicial usa kruskal().
+    """
+
+    def __init__(self, graph):
+        self.version = graph.version()
+        self._tree = {v: {} for v in graph.vertices()}  # v -> {u: peso} del árbol
+        self._weight = {}  # par -> peso no dirigido actual
+        self._spare = []  # [(peso, seq, par)] fuera del árbol, ordenado
+        self._seq = {}  # par -> desempate estable dentro de _spare
+        self._ids = {}  # v -> id para ordenar los pares
+        self._next_id = itertools.count()
+
+        for u, v, w in kruskal(graph):
+            self._tree[u][v] = w
+            self._tree[v][u] = w
+        for e in graph.edges():
+            u, v = e.endpoints()
+            if u != v:
+                pair = self._pair(u, v)
+                w = self._pair_weight(graph, u, v)
+                self._weight[pair] = w
+                if v not in self._tree[u]:
+                    self._seq.setdefault(pair, len(self._seq))
+                    self._spare.append((w, self._seq[pair], pair))
+        self._spare = sorted(set(self._spare))
+        graph.add_observer(self)
+
+    # ----- Consultas -----
+    def edges(self):
+        """[(u, v, peso), ...] del bosque, cada arista una vez."""
+        out = []
+        for u, adj in self._tree.items():
+            for v, w in adj.items():
+                if self._id(u) < self._id(v):
+                    out.append((u, v, w))
+        return out
+
+    def total_weight(self):
+        return sum(w for _, _, w in self.edges())
+
+    def __len__(self):
+        return sum(len(adj) for adj in self._tree.values()) // 2
+
+    # ----- Auxiliares -----
+    def _id(self, v):
+        i = self._ids.get(v)
+        if i is None:
+            i = self._ids[v] = next(self._next_id)
+        return i
+
+    def _pair(self, u, v):
+        return (u, v) if self._id(u) < self._id(v) else (v, u)
+
+    @staticmethod
+    def _pair_weight(graph, u, v):
+        pesos = [e.element() for e in (graph.get_edge(u, v), graph.get_edge(v, u)) if e is not None]
+        return min(pesos) if pesos else None
+
+    def _spare_add(self, pair, w):
+        self._seq.setdefault(pair, len(self._seq))
+        bisect.insort(self._spare, (w, self._seq[pair], pair))
+
+    def _spare_remove(self, pair, w):
+        item = (w, self._seq.get(pair), pair)
+        i = bisect.bisect_left(self._spare, item)
+        if i < len(self._spare) and self._spare[i] == item:
+            del self._spare[i]
+            return True
+        return False
+
+    def _link(self, u, v, w):
+        self._tree[u][v] = w
+        self._tree[v][u] = w
+
+    def _cut(self, u, v):
+        del self._tree[u][v]
+        del self._tree[v][u]
+
+    def _tree_path(self, u, v):
+        """Aristas [(a, b, peso)] del camino u..v en el bosque, o None si no están conectados."""
+        prev = {u: None}
+        queue = deque([u])
+        while queue:
+            x = queue.popleft()
+            if x == v:
+                break
+            for y in self._tree[x]:
+                if y not in prev:
+                    prev[y] = x
+                    queue.append(y)
+        if v not in prev:
+            return None
+        path = []
+        while prev[v] is not None:
+            a = prev[v]
+            path.append((a, v, self._tree[a][v]))
+            v = a
+        return path
+
+    def _component(self, u):
+        seen = {u}
+        stack = [u]
+        while stack:
+            for y in self._tree[stack.pop()]:
+                if y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+        return seen
+
+    def _reconnect(self, u):
+        """Tras un corte, une el componente de u con la arista de reemplazo más liviana."""
+        lado = self._component(u)
+        for i, (w, _, (a, b)) in enumerate(self._spare):
+            if (a in lado) != (b in lado):
+                del self._spare[i]
+                self._link(a, b, w)
+                return
+
+    def _insert_pair(self, u, v, w):
+        path = self._tree_path(u, v)
+        if path is None:
+            self._link(u, v, w)
+            return
+        a, b, w_max = max(path, key=lambda edge: edge[2])
+        if w_max > w:
+            # Sale la arista más pesada del ciclo y queda como reemplazo
+            self._cut(a, b)
+            self._spare_add(self._pair(a, b), w_max)
+            self._link(u, v, w)
+        else:
+            self._spare_add(self._pair(u, v), w)
+
+    def _pair_changed(self, graph, u, v):
+        if u == v:
+            return
+        pair = self._pair(u, v)
+        old = self._weight.get(pair)
+        new = self._pair_weight(graph, u, v)
+        if old == new:
+            return
+
+        if old is not None:
+            if v in self._tree[u]:
+                self._cut(u, v)
+                if new is not None and new <= old:
+                    # Se volvió más liviana: sigue siendo la mejor para este corte
+                    self._link(u, v, new)
+                    self._weight[pair] = new
+                    return
+                if new is None:
+                    del self._weight[pair]
+                else:
+                    self._weight[pair] = new
+                    self._spare_add(pair, new)
+                self._reconnect(u)
+                return
+            self._spare_remove(pair, old)
+
+        if new is None:
+            self._weight.pop(pair, None)
+            return
+        self._weight[pair] = new
+        self._insert_pair(u, v, new)
+
+    # ----- Eventos del grafo -----
+    def vertex_inserted(self, graph, v):
+        self._tree[v] = {}
+        self.version = graph.version()
+
+    def vertex_removed(self, graph, v):
+        # Sus aristas ya se quitaron con edge_removed
+        self._tree.pop(v, None)
+        self._ids.pop(v, None)
+        self.version = graph.version()
+
+    def edge_inserted(self, graph, e):
+        u, v = e.endpoints()
+        self._pair_changed(graph, u, v)
+        self.version = graph.version()
+
+    def edge_removed(self, graph, e):
+        u, v = e.endpoints()
+        self._pair_changed(graph, u, v)
+        self.version = graph.version()
+
+    def edge_weight_updated(self, graph, e, old):
+        u, v = e.endpoints()
+        self._pair_changed(graph, u, v)
+        self.version = graph.version()
+
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def minimum_spanning_tree(graph):
+    """
+    MST incremental del grafo. Se arma con Kruskal la primera vez y después
+    lo actualizan los eventos del grafo; solo se rearma si el grafo cambió
+    sin notificar.
+    """
+    mst = _cache.get(graph)
+    if mst is None or mst.version != graph.version():
+        if mst is not None:
+            graph.remove_observer(mst)
+        mst = DynamicMST(graph)
+        _cache[graph] = mst
+    return mst
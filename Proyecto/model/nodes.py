@@ -1,10 +1,29 @@
 # model/node_data.py
+from enum import Enum
+
+
+class Role(str, Enum):
+    """Rol de un nodo; compara y hashea igual que su texto ("almacen", ...)."""
+
+    ALMACEN = "almacen"
+    RECARGA = "recarga"
+    CLIENTE = "cliente"
+
+    __hash__ = str.__hash__
+
+    def __str__(self):
+        return self.value
+
 
 class Node:
-    def __init__(self, label, role, id):
+    __slots__ = ("label", "role", "id", "lat", "lon")
+
+    def __init__(self, label, role, id, lat=None, lon=None):
         self.label = label
-        self.role = role
+        self.role = Role(role)
         self.id = id
+        self.lat = lat  # coordenadas fijadas al generar la red
+        self.lon = lon
 
     def __hash__(self):
         return hash((self.label, self.role, self.id))
@@ -0,0 +1,294 @@
+# model/shortest_path.py
+#
+# Las búsquedas trabajan sobre la instantánea CSR (graph.freeze()): vértices
+# como ids enteros y arreglos de distancias/predecesores indexados por id.
+# Las funciones públicas aceptan un Graph o un CSRGraph y vértices del grafo.
+
+import heapq
+
+INF = float("inf")
+
+
+def dijkstra(csr, source, target=-1, targets=None):
+    """
+    Dijkstra con heap binario sobre ids de un CSRGraph.
+    Devuelve (dist, pred): listas indexadas por id (inf / -1 si no se alcanzó).
+    Si se indica target, la búsqueda termina apenas ese id queda fijo; con
+    targets (conjunto de ids) termina cuando todos quedaron fijos.
+    """
+    indptr, indices, weights = csr.lists()
+    n = len(indptr) - 1
+    dist = [INF] * n
+    pred = [-1] * n
+    done = bytearray(n)
+    dist[source] = 0
+    heap = [(0, source)]
+    remaining = len(targets) if targets else 0
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        if u == target:
+            break
+        if remaining and u in targets:
+            remaining -= 1
+            if not remaining:
+                break
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    return dist, pred
+
+
+def astar(csr, source, target, heuristic):
+    """
+    A* sobre ids de un CSRGraph. heuristic(i) estima el costo de i a target y
+    debe ser admisible (nunca sobreestimar) para que la ruta sea óptima.
+    Devuelve (dist, pred) igual que dijkstra.
+    """
+    indptr, indices, weights = csr.lists()
+    n = len(indptr) - 1
+    dist = [INF] * n
+    pred = [-1] * n
+    done = bytearray(n)
+    dist[source] = 0
+    heap = [(heuristic(source), source)]
+
+    while heap:
+        _, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        if u == target:
+            break
+        d = dist[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd + heuristic(v), v))
+
+    return dist, pred
+
+
+def multi_source_dijkstra(csr, sources):
+    """
+    Dijkstra desde varios orígenes a la vez (un súper-origen virtual con
+    aristas de peso 0 a cada uno). Devuelve (dist, pred, origin): origin[v]
+    es el id del origen más cercano a v, o -1 si ninguno lo alcanza. Las
+    rutas de pred parten siempre de ese origen.
+    """
+    indptr, indices, weights = csr.lists()
+    n = len(indptr) - 1
+    dist = [INF] * n
+    pred = [-1] * n
+    origin = [-1] * n
+    done = bytearray(n)
+    heap = []
+    for s in sources:
+        if dist[s] != 0:
+            dist[s] = 0
+            origin[s] = s
+            heap.append((0, s))
+    heapq.heapify(heap)
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        o = origin[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                origin[v] = o
+                heapq.heappush(heap, (nd, v))
+
+    return dist, pred, origin
+
+
+def bidirectional_dijkstra(csr, source, target):
+    """
+    Dijkstra bidireccional: avanza desde source por aristas salientes y desde
+    target por aristas entrantes hasta que ambas fronteras se cruzan.
+    Devuelve (path de ids, cost) o (None, None) si no hay camino.
+    """
+    if source == target:
+        return [source], 0
+
+    n = csr.num_vertices()
+    adj = (csr.lists(), csr.reverse().lists())
+    dist = ([INF] * n, [INF] * n)
+    pred = ([-1] * n, [-1] * n)
+    done = (bytearray(n), bytearray(n))
+    dist[0][source] = 0
+    dist[1][target] = 0
+    heaps = ([(0, source)], [(0, target)])
+    best, meet = INF, -1
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        # Se expande el lado con la frontera más barata
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if done[side][u]:
+            continue
+        done[side][u] = 1
+
+        indptr, indices, weights = adj[side]
+        mine, other = dist[side], dist[1 - side]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < mine[v]:
+                mine[v] = nd
+                pred[side][v] = u
+                heapq.heappush(heaps[side], (nd, v))
+            if nd + other[v] < best:
+                best = nd + other[v]
+                meet = v
+
+    if meet == -1:
+        return None, None
+
+    path = reconstruct_path(pred[0], meet)
+    v = pred[1][meet]
+    while v != -1:
+        path.append(v)
+        v = pred[1][v]
+    return path, best
+
+
+def battery_constrained(csr, source, target, capacity, is_station):
+    """
+    Ruta de costo mínimo con autonomía limitada sobre ids de un CSRGraph:
+    ningún tramo entre recargas puede superar capacity. Busca sobre estados
+    (vértice, batería restante); al llegar a un id con is_station[id] la
+    batería vuelve a capacity, por lo que la ruta puede usar varias recargas.
+    Devuelve (path de ids, cost) o (None, None) si no existe ruta factible.
+    """
+    indptr, indices, weights = csr.lists()
+    # Etiquetas: vértice y etiqueta padre, para reconstruir la ruta
+    label_vertex = [source]
+    label_parent = [-1]
+    heap = [(0, -capacity, 0)]
+    # Se extrae por costo creciente: una etiqueta está dominada si el vértice
+    # ya se fijó con al menos la misma batería
+    best_battery = [-1] * (len(indptr) - 1)
+
+    while heap:
+        cost, neg_battery, label = heapq.heappop(heap)
+        u = label_vertex[label]
+        battery = -neg_battery
+        if battery <= best_battery[u]:
+            continue
+        best_battery[u] = battery
+
+        if u == target:
+            path = []
+            while label != -1:
+                path.append(label_vertex[label])
+                label = label_parent[label]
+            path.reverse()
+            return path, cost
+
+        for k in range(indptr[u], indptr[u + 1]):
+            w = weights[k]
+            if w > battery:
+                continue
+            v = indices[k]
+            remaining = capacity if is_station[v] else battery - w
+            if remaining <= best_battery[v]:
+                continue
+            label_vertex.append(v)
+            label_parent.append(label)
+            heapq.heappush(heap, (cost + w, -remaining, len(label_vertex) - 1))
+
+    return None, None
+
+
+def reconstruct_path(pred, target):
+    """Recorre el arreglo de predecesores desde target hasta el origen."""
+    path = []
+    v = target
+    while v != -1:
+        path.append(v)
+        v = pred[v]
+    path.reverse()
+    return path
+
+
+def route_batch_ids(csr, pairs):
+    """
+    Rutea muchos pares (s, t) de ids agrupándolos por origen: un solo árbol
+    de Dijkstra por origen distinto, del que se leen todas sus rutas.
+    Devuelve [(path de ids, cost) o (None, None), ...] en el orden de pairs.
+    """
+    by_source = {}
+    for i, (s, _) in enumerate(pairs):
+        by_source.setdefault(s, []).append(i)
+
+    results = [None] * len(pairs)
+    for s, positions in by_source.items():
+        targets = {pairs[i][1] for i in positions}
+        dist, pred = dijkstra(csr, s, targets=targets)
+        for i in positions:
+            t = pairs[i][1]
+            results[i] = (reconstruct_path(pred, t), dist[t]) if dist[t] != INF else (None, None)
+    return results
+
+
+def shortest_path(graph, source, target, method="dijkstra", heuristic=None):
+    """
+    Ruta de costo mínimo entre los vértices source y target.
+    method: "dijkstra", "astar" (requiere heuristic(v, target) sobre vértices)
+    o "bidirectional".
+    Devuelve (path de vértices, cost) o (None, None) si target no es alcanzable.
+    """
+    csr = graph.freeze()
+    s, t = csr.index[source], csr.index[target]
+
+    if method == "bidirectional":
+        path, cost = bidirectional_dijkstra(csr, s, t)
+        if path is None:
+            return None, None
+        return [csr.vertices[i] for i in path], cost
+    if method == "astar":
+        vertices = csr.vertices
+        dist, pred = astar(csr, s, t, lambda i: heuristic(vertices[i], target))
+    elif method == "dijkstra":
+        dist, pred = dijkstra(csr, s, t)
+    else:
+        raise ValueError(f"Método de ruta desconocido: {method}")
+
+    if dist[t] == INF:
+        return None, None
+    return [csr.vertices[i] for i in reconstruct_path(pred, t)], dist[t]
+
+
+def battery_constrained_path(graph, source, target, capacity, stations):
+    """
+    Versión sobre vértices de battery_constrained: stations es el conjunto de
+    vértices de recarga. Devuelve (path de vértices, cost) o (None, None).
+    """
+    csr = graph.freeze()
+    is_station = bytearray(csr.num_vertices())
+    for v in stations:
+        is_station[csr.index[v]] = 1
+    path, cost = battery_constrained(csr, csr.index[source], csr.index[target], capacity, is_station)
+    if path is None:
+        return None, None
+    return [csr.vertices[i] for i in path], cost
@@ -0,0 +1,144 @@
+# model/spatial.py
+
+import math
+import weakref
+
+import numpy as np
+
+RADIO_TIERRA_KM = 6371.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distancia en km sobre la superficie terrestre entre dos coordenadas."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_km_array(lat1, lon1, lat2, lon2):
+    """haversine_km sobre arreglos numpy, elemento a elemento."""
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dp = p2 - p1
+    dl = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def distancia_km(u, v):
+    """
+    Distancia en línea recta entre dos vértices con coordenadas. Es una
+    heurística admisible para A* solo mientras cada arista pese al menos la
+    distancia entre sus extremos: generar_red redondea los pesos hacia arriba
+    y Graph.update_edge_weight rechaza pesos menores. Devuelve 0 si a alguno
+    le faltan coordenadas.
+    """
+    a, b = u.element(), v.element()
+    if getattr(a, "lat", None) is None or getattr(b, "lat", None) is None:
+        return 0
+    return haversine_km(a.lat, a.lon, b.lat, b.lon)
+
+
+class KDTree:
+    """
+    Árbol k-d de 2 dimensiones para consultas de vecino más cercano.
+    Las coordenadas se proyectan a un plano local en km (equirectangular),
+    suficiente para una red a escala de ciudad.
+    """
+
+    def __init__(self, items, lat0=None):
+        """items: lista de (lat, lon, objeto)."""
+        items = list(items)
+        if lat0 is None:
+            lat0 = sum(lat for lat, _, _ in items) / len(items) if items else 0.0
+        self._kx = RADIO_TIERRA_KM * math.cos(math.radians(lat0)) * math.pi / 180
+        self._ky = RADIO_TIERRA_KM * math.pi / 180
+
+        # Nodos en arreglos paralelos: punto, objeto e hijos por índice
+        self._x, self._y, self._obj = [], [], []
+        self._left, self._right, self._axis = [], [], []
+        puntos = [(lon * self._kx, lat * self._ky, obj) for lat, lon, obj in items]
+        self._root = self._build(puntos, 0)
+
+    def _build(self, puntos, depth):
+        if not puntos:
+            return -1
+        axis = depth % 2
+        puntos.sort(key=lambda p: p[axis])
+        mid = len(puntos) // 2
+        x, y, obj = puntos[mid]
+        i = len(self._x)
+        self._x.append(x)
+        self._y.append(y)
+        self._obj.append(obj)
+        self._axis.append(axis)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._left[i] = self._build(puntos[:mid], depth + 1)
+        self._right[i] = self._build(puntos[mid + 1:], depth + 1)
+        return i
+
+    def __len__(self):
+        return len(self._x)
+
+    def nearest(self, lat, lon):
+        """(objeto, distancia_km) del punto más cercano, o (None, None) si está vacío."""
+        if self._root == -1:
+            return None, None
+        qx, qy = lon * self._kx, lat * self._ky
+        best, best_d2 = -1, float("inf")
+        # Pila de (nodo, distancia² mínima posible a su región)
+        stack = [(self._root, 0.0)]
+        while stack:
+            i, bound = stack.pop()
+            if bound >= best_d2:
+                continue
+            dx, dy = qx - self._x[i], qy - self._y[i]
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2:
+                best, best_d2 = i, d2
+            diff = dx if self._axis[i] == 0 else dy
+            near, far = (self._left[i], self._right[i]) if diff < 0 else (self._right[i], self._left[i])
+            # La rama lejana solo vale la pena si el plano de corte está más cerca que el mejor
+            if far != -1:
+                stack.append((far, diff * diff))
+            if near != -1:
+                stack.append((near, bound))
+        return self._obj[best], math.sqrt(best_d2)
+
+
+class SpatialIndex:
+    """Un KDTree por rol de nodo (almacen, recarga, cliente) de una versión del grafo."""
+
+    def __init__(self, graph):
+        self.version = graph.version()
+        self._trees = {}
+        for role in graph.role_counts():
+            items = [(v.element().lat, v.element().lon, v) for v in graph.vertices_by_role(role)
+                     if getattr(v.element(), "lat", None) is not None]
+            if items:
+                self._trees[role] = KDTree(items)
+
+    def nearest(self, lat, lon, role):
+        """Vértice de ese rol más cercano a (lat, lon): (vertex, km) o (None, None)."""
+        tree = self._trees.get(role)
+        if tree is None:
+            return None, None
+        return tree.nearest(lat, lon)
+
+    def nearest_to(self, v, role):
+        e = v.element()
+        return self.nearest(e.lat, e.lon, role)
+
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def spatial_index(graph):
+    """Índice espacial del grafo, reconstruido solo si cambió su versión."""
+    index = _cache.get(graph)
+    if index is None or index.version != graph.version():
+        index = SpatialIndex(graph)
+        _cache[graph] = index
+    return index
@@ -1,10 +1,11 @@
 class Vertex:
     """Lightweight vertex structure for a graph."""
-    __slots__ = '_element'
+    __slots__ = '_element', '_hash'
 
     def __init__(self, element):
         """Do not call constructor directly. Use Graph's insert_vertex(element)."""
         self._element = element
+        self._hash = hash(element)  # computed once: vertices are dict keys everywhere
 
     def element(self):
         """Return element associated with this vertex."""
@@ -14,7 +15,7 @@ class Vertex:
         return isinstance(other, Vertex) and self._element == other._element
 
     def __hash__(self):
-        return hash(self._element)
+        return self._hash
 
     def __str__(self):
         return str(self._element)
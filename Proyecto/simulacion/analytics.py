@@ -0,0 +1,84 @@
+# sim/analytics.py
+
+
+class VisitAnalytics:
+    """
+    Visitas por nodo, al día en cada create_order, y cantidad de nodos por
+    rol (del índice de roles del grafo). Por rol se mantienen los k nodos
+    más visitados ordenados; como las visitas solo aumentan de a una, un
+    nodo entra al top cuando supera al último, y consultar el top cuesta O(k).
+    Se registra como observador del grafo para olvidar nodos eliminados.
+    """
+
+    def __init__(self, graph, k=5):
+        self.k = k
+        self._graph = graph
+        self.visits = {}  # vertex -> visitas
+        self._top = {}  # rol -> [[visitas, vertex], ...] de mayor a menor
+        self._in_top = set()
+        graph.add_observer(self)
+
+    def record(self, path):
+        """Suma una visita a cada nodo de la ruta de una orden."""
+        for v in path:
+            self._visit(v)
+
+    def _visit(self, v):
+        c = self.visits.get(v, 0) + 1
+        self.visits[v] = c
+        top = self._top.setdefault(_role(v), [])
+
+        if v in self._in_top:
+            i = next(i for i, entry in enumerate(top) if entry[1] is v)
+            top[i][0] = c
+        elif len(top) < self.k:
+            top.append([c, v])
+            self._in_top.add(v)
+            i = len(top) - 1
+        elif c > top[-1][0]:
+            self._in_top.discard(top[-1][1])
+            top[-1] = [c, v]
+            self._in_top.add(v)
+            i = len(top) - 1
+        else:
+            return
+        # Sube mientras supere al anterior
+        while i and top[i - 1][0] < c:
+            top[i - 1], top[i] = top[i], top[i - 1]
+            i -= 1
+
+    def restore(self, visits):
+        """Carga contadores guardados ({vertex: visitas}) y rearma los top por rol."""
+        self.visits = dict(visits)
+        self._top = {}
+        self._in_top = set()
+        for role in {_role(v) for v in self.visits}:
+            self._rebuild(role)
+
+    def top_visited(self, role, k=None):
+        """[(vertex, visitas), ...] de los más visitados del rol (k <= self.k)."""
+        top = self._top.get(role, [])
+        return [(v, c) for c, v in top[:k]]
+
+    def role_counts(self):
+        # Leídos del índice de roles del grafo
+        return self._graph.role_counts()
+
+    # ----- Eventos del grafo -----
+    def vertex_removed(self, graph, v):
+        role = _role(v)
+        if self.visits.pop(v, None) is not None and v in self._in_top:
+            # Caso raro: se rearma el top de ese rol desde los contadores
+            self._rebuild(role)
+
+    def _rebuild(self, role):
+        for _, u in self._top.get(role, []):
+            self._in_top.discard(u)
+        mejores = sorted(((c, u) for u, c in self.visits.items() if _role(u) == role),
+                         key=lambda item: -item[0])[:self.k]
+        self._top[role] = [[c, u] for c, u in mejores]
+        self._in_top.update(u for _, u in mejores)
+
+
+def _role(v):
+    return getattr(v.element(), "role", None)
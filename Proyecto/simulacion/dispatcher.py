@@ -0,0 +1,175 @@
+# sim/dispatcher.py
+#
+# Agrupa las órdenes pendientes en vuelos de varias paradas. Por cada origen
+# (depósito) se aplica el algoritmo de ahorros de Clarke-Wright y luego 2-opt
+# a cada vuelo, usando las distancias de all_pairs. Un vuelo sale del
+# depósito, visita sus paradas y vuelve, sin superar la autonomía del dron.
+
+from model.all_pairs import all_pairs
+from model.shortest_path import INF
+
+
+class Tour:
+    """Un vuelo: depósito, paradas en orden de visita y órdenes que entrega."""
+
+    __slots__ = ("depot", "stops", "orders", "distance")
+
+    def __init__(self, depot, stops, orders, distance):
+        self.depot = depot
+        self.stops = stops
+        self.orders = orders
+        self.distance = distance
+
+    def path(self, apsp):
+        """Ruta completa de vértices: depósito -> paradas -> depósito."""
+        puntos = [self.depot] + self.stops + [self.depot]
+        path = [self.depot]
+        for u, v in zip(puntos, puntos[1:]):
+            path.extend(apsp.path(u, v)[1:])
+        return path
+
+    def __repr__(self):
+        return f"Tour({self.depot} -> {' -> '.join(str(s) for s in self.stops)}, {round(self.distance, 2)} km)"
+
+
+class DispatchPlan:
+    """Vuelos planificados y comparación contra un vuelo de ida y vuelta por orden."""
+
+    def __init__(self, tours, baseline_distance, baseline_flights, unroutable):
+        self.tours = tours
+        self.baseline_distance = baseline_distance
+        self.baseline_flights = baseline_flights
+        self.unroutable = unroutable  # órdenes sin ida y vuelta posible
+
+    @property
+    def total_distance(self):
+        return sum(t.distance for t in self.tours)
+
+    @property
+    def flights(self):
+        return len(self.tours)
+
+    def summary(self):
+        delivered = sum(len(t.orders) for t in self.tours)
+        total = self.total_distance
+        return {
+            "orders": delivered,
+            "flights": self.flights,
+            "orders_per_flight": round(delivered / self.flights, 2) if self.flights else None,
+            "distance": round(total, 2),
+            "baseline_flights": self.baseline_flights,
+            "baseline_distance": round(self.baseline_distance, 2),
+            "distance_saved_pct": round(100 * (1 - total / self.baseline_distance), 2)
+            if self.baseline_distance else None,
+            "unroutable": len(self.unroutable),
+        }
+
+
+def plan_dispatch(sim, capacity=50, max_stops=None, orders=None):
+    """
+    Planifica los vuelos de las órdenes pendientes de sim (o de orders).
+    capacity: km que el dron vuela con una carga. max_stops: paradas por
+    vuelo como máximo (None: sin límite).
+    """
+    if orders is None:
+        orders = [o for o in sim.orders.values() if o.status == "pending"]
+    apsp = all_pairs(sim.graph)
+    index = apsp.index
+
+    por_deposito = {}
+    for order in orders:
+        por_deposito.setdefault(order.origin, []).append(order)
+
+    tours, unroutable = [], []
+    baseline_distance, baseline_flights = 0.0, 0
+    for depot, grupo in por_deposito.items():
+        # Las órdenes al mismo destino comparten parada
+        paradas = {}
+        for order in grupo:
+            paradas.setdefault(order.destination, []).append(order)
+
+        stops = list(paradas)
+        ids = [index[depot]] + [index[s] for s in stops]
+        dist = apsp.dist[ids][:, ids].tolist()
+
+        servibles = []
+        for k, stop in enumerate(stops, start=1):
+            ida_vuelta = dist[0][k] + dist[k][0]
+            if ida_vuelta == INF:
+                unroutable.extend(paradas[stop])
+                continue
+            servibles.append(k)
+            baseline_distance += ida_vuelta * len(paradas[stop])
+            baseline_flights += len(paradas[stop])
+
+        for route in _savings(dist, servibles, capacity, max_stops):
+            route, length = _two_opt(dist, route)
+            route_stops = [stops[k - 1] for k in route]
+            route_orders = [o for s in route_stops for o in paradas[s]]
+            tours.append(Tour(depot, route_stops, route_orders, length))
+
+    return DispatchPlan(tours, baseline_distance, baseline_flights, unroutable)
+
+
+def _tour_length(dist, route):
+    # Largo de 0 -> route -> 0 en la submatriz (0 es el depósito)
+    total = dist[0][route[0]] + dist[route[-1]][0]
+    for a, b in zip(route, route[1:]):
+        total += dist[a][b]
+    return total
+
+
+def _savings(dist, nodes, capacity, max_stops):
+    """
+    Clarke-Wright con distancias asimétricas: unir un vuelo que termina en i
+    con otro que empieza en j ahorra d(i,0) + d(0,j) - d(i,j).
+    """
+    routes = {k: [k] for k in nodes}  # id de vuelo -> paradas
+    length = {k: dist[0][k] + dist[k][0] for k in nodes}
+    route_of = {k: k for k in nodes}
+
+    savings = []
+    for i in nodes:
+        for j in nodes:
+            if i != j and dist[i][j] != INF:
+                s = dist[i][0] + dist[0][j] - dist[i][j]
+                if s > 0:
+                    savings.append((s, i, j))
+    savings.sort(reverse=True)
+
+    for s, i, j in savings:
+        a, b = route_of[i], route_of[j]
+        if a == b or routes[a][-1] != i or routes[b][0] != j:
+            continue
+        if max_stops is not None and len(routes[a]) + len(routes[b]) > max_stops:
+            continue
+        nuevo = length[a] + length[b] - s
+        if nuevo > capacity:
+            continue
+        routes[a].extend(routes[b])
+        length[a] = nuevo
+        for k in routes.pop(b):
+            route_of[k] = a
+        del length[b]
+
+    # Vuelos de una parada que exceden la autonomía se mantienen: el dron
+    # recarga en ruta igual que sin agrupar
+    return list(routes.values())
+
+
+def _two_opt(dist, route):
+    """Mejora un vuelo invirtiendo tramos mientras se acorte (primera mejora)."""
+    best = _tour_length(dist, route)
+    mejoro = len(route) > 2
+    while mejoro:
+        mejoro = False
+        for i in range(len(route) - 1):
+            for j in range(i + 2, len(route) + 1):
+                candidato = route[:i] + route[i:j][::-1] + route[j:]
+                largo = _tour_length(dist, candidato)
+                if largo < best - 1e-9:
+                    route, best, mejoro = candidato, largo, True
+                    break
+            if mejoro:
+                break
+    return route, best
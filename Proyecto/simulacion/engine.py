@@ -0,0 +1,184 @@
+# sim/engine.py
+#
+# Motor de eventos discretos: el tiempo avanza de evento en evento (llegada
+# de una orden, entrega, regreso de un dron) leídos de un heap, en minutos
+# simulados desde self.start. Las órdenes pendientes esperan en otro heap
+# ordenado por prioridad: mayor Order.priority se despacha primero y, a
+# igual prioridad, la que llegó antes.
+
+import heapq
+import itertools
+import time
+from datetime import datetime
+
+# Tipos de evento
+ORDER_ARRIVAL = 0
+ORDER_DELIVERED = 1
+DRONE_AVAILABLE = 2
+
+
+class Drone:
+    """Dron de la flota: batería en km de vuelo y contadores de uso."""
+
+    __slots__ = ("drone_id", "capacity", "battery", "speed", "deliveries", "distance", "busy_time",
+                 "busy_since", "charges")
+
+    def __init__(self, drone_id, capacity=50, speed=1.0):
+        self.drone_id = drone_id
+        self.capacity = capacity  # km con batería llena
+        self.battery = capacity
+        self.speed = speed  # km por minuto
+        self.deliveries = 0
+        self.distance = 0.0
+        self.busy_time = 0.0  # minutos ocupado en vuelos ya terminados
+        self.busy_since = None  # inicio del vuelo en curso
+        self.charges = 0
+
+    def __repr__(self):
+        return f"Drone({self.drone_id}, batería={round(self.battery, 2)}/{self.capacity})"
+
+
+class EventEngine:
+    """
+    Lleva las órdenes de una Simulation hasta complete_delivery con una flota
+    de n_drones. Cada vuelo es de ida y vuelta por la ruta de la orden; si la
+    batería no alcanza, el dron recarga en la base (charge_rate km por
+    minuto) antes de salir, y los viajes más largos que la capacidad suman el
+    tiempo de las recargas en ruta.
+    """
+
+    def __init__(self, sim, n_drones=5, capacity=50, speed=1.0, charge_rate=1.0, start=None):
+        self.sim = sim
+        self.drones = [Drone(i, capacity, speed) for i in range(n_drones)]
+        self.charge_rate = charge_rate
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        self.start = start if start is not None else time.time()  # segundos epoch
+        self.now = 0.0
+
+        self._events = []  # (tiempo, seq, tipo, a, b)
+        self._pending = []  # (-prioridad, seq, llegada, orden)
+        self._idle = list(reversed(self.drones))
+        self._seq = itertools.count()
+
+        self.events_processed = 0
+        self.delivered = 0
+        self.total_wait = 0.0  # minutos desde la llegada hasta la entrega
+
+    def timestamp(self, t):
+        """Fecha simulada (segundos epoch) correspondiente al minuto t."""
+        return self.start + t * 60
+
+    def submit(self, order, at=None):
+        """Programa la llegada de order en el minuto at (por defecto, ahora)."""
+        at = self.now if at is None else at
+        heapq.heappush(self._events, (at, next(self._seq), ORDER_ARRIVAL, order, None))
+
+    def submit_all(self, orders, interarrival=None):
+        """
+        Programa varias órdenes desde el instante actual. interarrival() da el
+        tiempo hasta la siguiente llegada (p. ej. random.expovariate); sin él
+        llegan todas juntas.
+        """
+        t = self.now
+        for order in orders:
+            self.submit(order, t)
+            if interarrival is not None:
+                t += interarrival()
+
+    def run(self, until=None, max_events=None):
+        """
+        Procesa eventos hasta vaciar la cola, pasar el minuto until o llegar
+        a max_events. Devuelve stats().
+        """
+        events = self._events
+        pop = heapq.heappop
+        processed = 0
+        while events:
+            if until is not None and events[0][0] > until:
+                self.now = until
+                break
+            if max_events is not None and processed >= max_events:
+                break
+            t, _, kind, a, b = pop(events)
+            self.now = t
+            processed += 1
+
+            if kind == ORDER_ARRIVAL:
+                self._on_arrival(a)
+            elif kind == ORDER_DELIVERED:
+                self._on_delivered(a, b)
+            else:
+                a.busy_time += t - a.busy_since
+                a.busy_since = None
+                self._idle.append(a)
+            # Se despacha una vez procesados todos los eventos de este instante,
+            # así las órdenes que llegan juntas compiten por prioridad
+            if not events or events[0][0] > t:
+                self._dispatch()
+
+        self.events_processed += processed
+        return self.stats()
+
+    # ----- Manejadores -----
+    def _on_arrival(self, order):
+        self.sim.receive_order(order, self.timestamp(self.now))
+        heapq.heappush(self._pending, (-order.priority, next(self._seq), self.now, order))
+
+    def _on_delivered(self, order, arrival):
+        self.sim.complete_order(order, order.total_cost, self.timestamp(self.now))
+        self.delivered += 1
+        self.total_wait += self.now - arrival
+
+    def _dispatch(self):
+        while self._idle and self._pending:
+            _, _, arrival, order = heapq.heappop(self._pending)
+            self._fly(self._idle.pop(), order, arrival)
+
+    def _fly(self, drone, order, arrival):
+        cost = order.total_cost
+        energy = 2 * cost
+        t = self.now
+
+        if energy > drone.battery:
+            # Recarga completa en la base antes de salir
+            t += (drone.capacity - drone.battery) / self.charge_rate
+            drone.battery = drone.capacity
+            drone.charges += 1
+        if energy > drone.battery:
+            # Vuelo más largo que la batería: recargas en ruta
+            t += (energy - drone.battery) / self.charge_rate
+            drone.charges += 1
+            drone.battery = 0
+        else:
+            drone.battery -= energy
+
+        self.sim.start_order(order)
+        delivered_at = t + cost / drone.speed
+        back_at = t + energy / drone.speed
+        drone.deliveries += 1
+        drone.distance += energy
+        drone.busy_since = self.now  # se suma al volver, o hasta now en stats()
+
+        seq = self._seq
+        heapq.heappush(self._events, (delivered_at, next(seq), ORDER_DELIVERED, order, arrival))
+        heapq.heappush(self._events, (back_at, next(seq), DRONE_AVAILABLE, drone, None))
+
+    def busy_time(self, drone):
+        """Minutos que drone estuvo ocupado hasta self.now (el vuelo en curso, recortado)."""
+        if drone.busy_since is None:
+            return drone.busy_time
+        return drone.busy_time + self.now - drone.busy_since
+
+    def stats(self):
+        elapsed = self.now or 1.0
+        return {
+            "minutes": round(self.now, 2),
+            "events": self.events_processed,
+            "delivered": self.delivered,
+            "waiting": len(self._pending),
+            "mean_delivery_minutes": round(self.total_wait / self.delivered, 2) if self.delivered else None,
+            "fleet_utilization": round(
+                sum(self.busy_time(d) for d in self.drones) / (elapsed * len(self.drones)), 3
+            ) if self.drones else None,
+        }
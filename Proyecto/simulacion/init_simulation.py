@@ -2,49 +2,110 @@
 
 # sim/init_simulation.py
 
+import gc
 import random
+
+import numpy as np
+
 from model.graph import Graph
-from model.vertex import Vertex
-from model.edge import Edge
-from model.nodes import NodeData
-
-def generar_red(n_nodes, m_edges, n_almacen, n_recarga, n_clientes):
-    graph = Graph(directed=True)
-
-    # Crear roles con metadata explícita (dict)
-    roles = (
-        [{"role": "almacen", "emoji": "📦", "id": f"N{i}"} for i in range(n_almacen)] +
-        [{"role": "recarga", "emoji": "🔋", "id": f"N{i}"} for i in range(n_recarga)] +
-        [{"role": "cliente", "emoji": "👤", "id": f"N{i}"} for i in range(n_clientes)]
-    )
-
-    random.shuffle(roles)
-
-    vertices = []
-    for i in range(n_nodes):
-        data = roles[i]
-        label = f"{data['emoji']} {data['id']}"
-        vdata = NodeData(label, data["role"], data["id"])
-        v = graph.insert_vertex(vdata)
-        vertices.append(v)
-
-    # Paso 1: Conectar todos los nodos en una cadena para asegurar conexidad
-    for i in range(n_nodes - 1):
-        u = vertices[i]
-        v = vertices[i + 1]
-        graph.insert_edge(u, v, random.randint(1, 10))
-
-    # Paso 2: Agregar aristas aleatorias adicionales sin duplicar
-    added = set((vertices[i], vertices[i + 1]) for i in range(n_nodes - 1))
-    while len(added) < m_edges:
-        u, v = random.sample(vertices, 2)
-        if (u, v) not in added:
-            graph.insert_edge(u, v, random.randint(1, 10))
-            added.add((u, v))
+from model.nodes import Node
+from model.spatial import haversine_km_array
+
+# Centro de la red (Temuco) y semiancho en grados del área de los nodos
+CENTRO_LAT, CENTRO_LON = -38.735, -72.590
+DISPERSION = 0.05
+
+def generar_red(n_nodes, m_edges, n_almacen, n_recarga, n_clientes, seed=None):
+    # seed: semilla propia para reproducir la red; sin ella la semilla sale
+    # del random global, así random.seed(...) sigue reproduciendo la red
+    rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+
+    n_chain = max(n_nodes - 1, 0)
+    max_edges = n_nodes * (n_nodes - 1)
+    if m_edges > max_edges:
+        raise ValueError(f"Un grafo dirigido de {n_nodes} nodos admite como máximo {max_edges} aristas")
+    if n_almacen + n_recarga + n_clientes < n_nodes:
+        raise ValueError("La suma de almacenes, recargas y clientes debe cubrir todos los nodos")
+
+    # Se crean millones de objetos que nunca forman ciclos: pausar el
+    # recolector evita recorridos completos del heap durante la construcción
+    gc_activo = gc.isenabled()
+    gc.disable()
+
+    try:
+        # Crear roles con metadata explícita (role, emoji, id)
+        roles = (
+            [("almacen", "📦", f"N{i}") for i in range(n_almacen)] +
+            [("recarga", "🔋", f"N{i}") for i in range(n_recarga)] +
+            [("cliente", "👤", f"N{i}") for i in range(n_clientes)]
+        )
+        orden = rng.permutation(len(roles))[:n_nodes].tolist()
+
+        lat = CENTRO_LAT + rng.uniform(-DISPERSION, DISPERSION, n_nodes)
+        lon = CENTRO_LON + rng.uniform(-DISPERSION, DISPERSION, n_nodes)
+        nodes = [Node(f"{emoji} {node_id}", role, node_id, a, b)
+                 for (role, emoji, node_id), a, b in zip((roles[i] for i in orden), lat.tolist(), lon.tolist())]
+
+        # Paso 1: Conectar todos los nodos en una cadena para asegurar conexidad
+        chain = np.arange(n_chain, dtype=np.int64)
+
+        # Paso 2: Aristas adicionales sin duplicar y sin rechazo. Los pares
+        # ordenados (u, v), u != v, se numeran 0..n(n-1)-1 como u*(n-1) + v', con
+        # v' = v si v < u y v - 1 si no; las aristas de la cadena (i, i+1) son
+        # justo los múltiplos de n. Se muestrean k índices distintos del espacio
+        # sin la cadena y se traducen de vuelta a pares, todo sobre arreglos.
+        k = max(m_edges - n_chain, 0)
+        stride = max(n_nodes - 1, 1)
+        j = rng.choice(stride * stride, k, replace=False) if k else np.zeros(0, dtype=np.int64)
+        u, r = np.divmod((j // stride) * n_nodes + 1 + j % stride, stride)
+        v = np.where(r < u, r, r + 1)
+
+        sources = np.concatenate((chain, u))
+        targets = np.concatenate((chain + 1, v))
+        # Distancia real en km, redondeada hacia arriba: nunca menor que la línea
+        # recta, así la distancia haversine sigue siendo admisible para A*
+        weights = np.ceil(haversine_km_array(lat[sources], lon[sources], lat[targets], lon[targets]) * 100) / 100
+
+        graph = Graph.from_edges(nodes, sources, targets, weights, directed=True)
+    finally:
+        if gc_activo:
+            gc.enable()
 
     # Guardar los vértices para uso en selectbox (opcional)
-    graph._vertices_list = vertices
+    graph._vertices_list = list(graph.vertices())
 
     from simulacion.simulation import Simulation
     sim = Simulation(graph)
     return graph, sim
+
+
+def registrar_clientes(sim, n_clientes):
+    # Registra los clientes C000, C001, ... con tipo aleatorio
+    for i in range(n_clientes):
+        client_id = f"C{i:03}"
+        name = f"Cliente {i}"
+        client_type = random.choice(["premium", "normal"])
+        sim.register_client(client_id, name, client_type)
+
+
+def generar_ordenes(sim, n_orders, workers=1, despacho="cliente"):
+    # Crea n_orders órdenes entre clientes al azar, ruteadas por costo mínimo.
+    # Los pares se sortean primero, así el resultado no depende de workers.
+    # Con despacho="almacen" cada orden sale del almacén más cercano a su destino.
+    client_nodes = list(sim.graph.vertices_by_role("cliente"))
+    if despacho == "almacen":
+        if client_nodes:
+            requests = [(f"C{i:03}", random.choice(client_nodes), 1) for i in range(n_orders)]
+            sim.dispatch_orders(requests)
+        return
+    if len(client_nodes) < 2:
+        return
+    requests = []
+    for i in range(n_orders):
+        origin = random.choice(client_nodes)
+        destination = random.choice(client_nodes)
+        while destination == origin:
+            destination = random.choice(client_nodes)
+        requests.append((f"C{i:03}", origin, destination, 1))
+
+    sim.create_orders_batch(requests, workers=workers)
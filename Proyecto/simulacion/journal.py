@@ -0,0 +1,282 @@
+# sim/journal.py
+#
+# Registro durable de órdenes: un archivo de solo agregado con registros de
+# tamaño fijo (RECORD_SIZE bytes) y un archivo compañero <ruta>.paths con las
+# rutas como ids int32 concatenados. Cada evento de una orden (creada,
+# recibida, en vuelo, entregada) es un registro; el estado actual se obtiene
+# reproduciendo el archivo. Los vértices se guardan por su posición en
+# graph.vertices() al abrir el registro, con una huella de las etiquetas en la
+# cabecera para no reproducirlo sobre otra red.
+
+import bisect
+import os
+import struct
+import zlib
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+MAGIC = b"ORDJ"
+FORMAT_VERSION = 1
+
+# Tipos de evento
+ORDER_CREATED = 0
+ORDER_RECEIVED = 1
+ORDER_STARTED = 2
+ORDER_DELIVERED = 3
+
+# tipo, prioridad, order_id, client_id, origen, destino, fecha (epoch),
+# costo, inicio de la ruta en .paths y largo de la ruta. El inicio se anota
+# también en los eventos sin ruta, así inicio + largo no decrece nunca
+RECORD = struct.Struct("<B3xi16s16siiddqi4x")
+RECORD_SIZE = RECORD.size
+# La cabecera ocupa un registro: el registro i empieza en (i + 1) * RECORD_SIZE
+HEADER = struct.Struct(f"<4sHHiI{RECORD_SIZE - 16}x")
+
+RECORD_DTYPE = np.dtype({
+    "names": ["kind", "priority", "order_id", "client_id", "origin", "destination",
+              "time", "cost", "path_offset", "path_len"],
+    "formats": ["u1", "<i4", "S16", "S16", "<i4", "<i4", "<f8", "<f8", "<i8", "<i4"],
+    "offsets": [0, 4, 8, 24, 40, 44, 48, 56, 64, 72],
+    "itemsize": RECORD_SIZE,
+})
+
+Record = namedtuple("Record", "kind order_id client_id priority origin destination time cost path")
+
+
+def graph_fingerprint(graph):
+    """(cantidad de vértices, crc32 de sus etiquetas en orden) para validar el registro."""
+    labels = "\n".join(str(v) for v in graph.vertices())
+    return len(graph.vertices()), zlib.crc32(labels.encode("utf-8"))
+
+
+def _complete(records, n_paths):
+    # Búsqueda binaria del primer registro cuya ruta no alcanzó a escribirse
+    offsets, lens = records["path_offset"], records["path_len"]
+    return bisect.bisect_right(range(len(records)), n_paths, key=lambda i: int(offsets[i]) + int(lens[i]))
+
+
+def _fixed(text, campo):
+    data = text.encode("utf-8")
+    if len(data) > 16:
+        raise ValueError(f"{campo} no cabe en un registro (máx. 16 bytes): {text!r}")
+    return data
+
+
+class OrderJournal:
+    """
+    Escritor del registro de órdenes. Los registros se acumulan en un búfer
+    y se escriben cada buffer_records eventos; fsync del archivo de registros
+    se hace recién cada fsync_every eventos (y en flush(sync=True) / close()),
+    así el costo de durabilidad se reparte entre muchas órdenes. Las rutas de
+    un bloque sí se sincronizan antes de escribir los registros que las usan.
+    Si el archivo ya existe se sigue agregando al final: se descartan un
+    último registro o id de ruta incompletos y los registros cuya ruta no
+    llegó a .paths, como hace JournalReader al leer.
+    """
+
+    def __init__(self, path, graph, buffer_records=1024, fsync_every=65536):
+        self.path = path
+        self.buffer_records = buffer_records
+        self.fsync_every = fsync_every
+        self._ids = {v: i for i, v in enumerate(graph.vertices())}
+        self._routes = {}  # clave de ruta -> ids del registro como bytes int32
+        self._records = bytearray()
+        self._paths = bytearray()
+        self._pending = 0  # registros en el búfer
+        self._unsynced = 0  # registros escritos sin fsync
+
+        n, crc = graph_fingerprint(graph)
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, n, crc)
+        existe = os.path.exists(path) and os.path.getsize(path) >= RECORD_SIZE
+        self._file = open(path, "r+b" if existe else "wb", buffering=0)
+        self._path_file = open(path + ".paths", "ab", buffering=0)
+        if existe:
+            if self._file.read(RECORD_SIZE) != header:
+                self.close()
+                raise ValueError(f"{path} es de otra red o de otro formato")
+            self._recover()
+        else:
+            self._file.write(header)
+            self._path_file.truncate(0)
+        self._file.seek(0, os.SEEK_END)
+        self._path_count = os.path.getsize(path + ".paths") // 4
+        self.records = self._file.tell() // RECORD_SIZE - 1
+
+    def _recover(self):
+        # Los dos archivos se sincronizan por separado, así que tras un corte
+        # .paths puede quedar más corto que lo que apuntan los registros
+        n = os.path.getsize(self.path) // RECORD_SIZE - 1
+        n_paths = os.path.getsize(self.path + ".paths") // 4
+        keep, end = 0, 0
+        if n > 0:
+            records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=RECORD_SIZE, shape=(n,))
+            keep = _complete(records, n_paths)
+            if keep:
+                end = int(records["path_offset"][keep - 1]) + int(records["path_len"][keep - 1])
+            del records
+        self._file.truncate((keep + 1) * RECORD_SIZE)
+        # Rutas sin registro que las use (o un id a medio escribir) se descartan
+        self._path_file.truncate(end * 4)
+
+    # ----- Eventos -----
+    def order_created(self, order):
+        ruta = self._routes.get(order.path_key)
+        if ruta is None:
+            ruta = self._routes[order.path_key] = array("i", (self._id(v) for v in order.path)).tobytes()
+        self._append(ORDER_CREATED, order, order.created_at, order.total_cost, ruta)
+
+    def order_received(self, order):
+        self._append(ORDER_RECEIVED, order, order.created_at, order.total_cost)
+
+    def order_started(self, order):
+        self._append(ORDER_STARTED, order, np.nan, order.total_cost)
+
+    def order_delivered(self, order):
+        self._append(ORDER_DELIVERED, order, order.delivered_at, order.total_cost)
+
+    def _id(self, v):
+        i = self._ids.get(v)
+        if i is None:
+            raise ValueError(f"El vértice {v} no existía al abrir el registro")
+        return i
+
+    def _append(self, kind, order, at, cost, ruta=b""):
+        n = len(ruta) // 4
+        self._records += RECORD.pack(
+            kind, order.priority, _fixed(order.order_id, "order_id"), _fixed(order.client_id, "client_id"),
+            self._id(order.origin), self._id(order.destination), at, cost,
+            self._path_count, n)
+        if n:
+            self._paths += ruta
+            self._path_count += n
+        self._pending += 1
+        if self._pending >= self.buffer_records:
+            self.flush()
+
+    # ----- Escritura -----
+    def flush(self, sync=False):
+        """Escribe el búfer; con sync (o al juntar fsync_every eventos) además hace fsync."""
+        if self._pending:
+            # Primero las rutas, ya en disco: un registro nunca apunta a datos
+            # que un corte pueda perder
+            if self._paths:
+                self._path_file.write(self._paths)
+                os.fsync(self._path_file.fileno())
+            self._file.write(self._records)
+            self._paths.clear()
+            self._records.clear()
+            self.records += self._pending
+            self._unsynced += self._pending
+            self._pending = 0
+        if self._unsynced and (sync or self._unsynced >= self.fsync_every):
+            os.fsync(self._path_file.fileno())
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush(sync=True)
+            self._file.close()
+            self._path_file.close()
+
+    def __len__(self):
+        return self.records + self._pending
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JournalReader:
+    """
+    Lectura perezosa de un registro: los registros y las rutas se mapean con
+    memmap y se recorren por bloques, sin cargar el historial completo. Un
+    último registro incompleto (o con la ruta sin escribir) se ignora.
+    """
+
+    def __init__(self, path, chunk=65536):
+        self.path = path
+        self.chunk = chunk
+        with open(path, "rb") as f:
+            magic, version, size, self.n_vertices, self.crc = HEADER.unpack(f.read(RECORD_SIZE))
+        if magic != MAGIC or version != FORMAT_VERSION or size != RECORD_SIZE:
+            raise ValueError(f"{path} no es un registro de órdenes compatible")
+
+        n = os.path.getsize(path) // RECORD_SIZE - 1
+        n_paths = os.path.getsize(path + ".paths") // 4 if os.path.exists(path + ".paths") else 0
+        self._records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=RECORD_SIZE, shape=(n,)) \
+            if n > 0 else np.zeros(0, dtype=RECORD_DTYPE)
+        self._paths = np.memmap(path + ".paths", dtype=np.int32, mode="r", shape=(n_paths,)) \
+            if n_paths else np.zeros(0, dtype=np.int32)
+        self._n = _complete(self._records, n_paths)
+
+    def __len__(self):
+        return self._n
+
+    def check(self, graph):
+        """Verifica que el registro se escribió sobre esta misma red."""
+        if (self.n_vertices, self.crc) != graph_fingerprint(graph):
+            raise ValueError(f"{self.path} se escribió sobre otra red")
+
+    def records(self, start=0, stop=None):
+        """Genera los registros (Record) de start a stop, leyendo un bloque a la vez."""
+        stop = self._n if stop is None else min(stop, self._n)
+        for lo in range(max(start, 0), stop, self.chunk):
+            block = self._records[lo:min(lo + self.chunk, stop)]
+            paths = self._paths
+            for kind, priority, order_id, client_id, origin, destination, at, cost, offset, n in zip(
+                    *(block[name].tolist() for name in RECORD_DTYPE.names)):
+                yield Record(kind, order_id.decode("utf-8"), client_id.decode("utf-8"), priority,
+                             origin, destination, None if at != at else at, cost,
+                             paths[offset:offset + n].tolist() if n else None)
+
+    def __iter__(self):
+        return self.records()
+
+    def tail(self, n):
+        """Los últimos n registros."""
+        return self.records(max(self._n - n, 0))
+
+    def replay(self, sim):
+        """
+        Reconstruye en sim (recién creada sobre la misma red, sin órdenes) el
+        estado que dejó el registro: órdenes, rutas del AVL, columnas, fechas
+        y estados. Como en la simulación en vivo, las entregadas quedan solo
+        en sim.order_store. Devuelve la cantidad de registros aplicados.
+        """
+        self.check(sim.graph)
+        vertices = list(sim.graph.vertices())
+        journal, sim.journal = sim.journal, None  # no volver a registrar lo reproducido
+        try:
+            for rec in self.records():
+                if rec.kind == ORDER_CREATED:
+                    order = sim.create_order(rec.client_id, vertices[rec.origin], vertices[rec.destination],
+                                             rec.priority, [vertices[i] for i in rec.path], rec.cost,
+                                             order_id=rec.order_id, created_at=rec.time)
+                    continue
+                order = sim.orders.get(rec.order_id)
+                if order is None:
+                    continue
+                if rec.kind == ORDER_RECEIVED:
+                    sim.receive_order(order, rec.time)
+                elif rec.kind == ORDER_STARTED:
+                    sim.start_order(order)
+                elif rec.kind == ORDER_DELIVERED:
+                    sim.complete_order(order, rec.cost, rec.time)
+        finally:
+            sim.journal = journal
+        return self._n
+
+    def close(self):
+        # Suelta los mapas; el archivo se cierra cuando no quedan vistas
+        self._records = self._paths = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,251 @@
+# sim/order_store.py
+
+from datetime import datetime
+
+import numpy as np
+
+STATUSES = ("pending", "in_transit", "delivered")
+_STATUS_CODE = {s: i for i, s in enumerate(STATUSES)}
+
+
+class _Column:
+    """Arreglo numpy que crece por duplicación; data[:n] son las filas válidas."""
+
+    __slots__ = ("data", "n")
+
+    def __init__(self, dtype, capacity=64):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.n = 0
+
+    @classmethod
+    def wrap(cls, data):
+        """Columna llena sobre un arreglo existente (p. ej. un memmap), sin copiarlo."""
+        col = cls.__new__(cls)
+        col.data = data
+        col.n = len(data)
+        return col
+
+    def append(self, value):
+        if self.n == len(self.data):
+            self._grow(self.n + 1)
+        self.data[self.n] = value
+        self.n += 1
+
+    def extend(self, values):
+        k = len(values)
+        if self.n + k > len(self.data):
+            self._grow(self.n + k)
+        self.data[self.n:self.n + k] = values
+        self.n += k
+
+    def _grow(self, needed):
+        # Arreglo nuevo: las vistas entregadas antes siguen apuntando al anterior
+        data = np.empty(max(needed, 2 * len(self.data)), dtype=self.data.dtype)
+        data[:self.n] = self.data[:self.n]
+        self.data = data
+
+    def view(self):
+        return self.data[:self.n]
+
+
+class OrderStore:
+    """
+    Órdenes en columnas: una fila por orden, con clientes y vértices como
+    códigos enteros (los vértices con los ids de la RouteTable) y las rutas
+    concatenadas en un solo arreglo de ids, indexado por path_offsets.
+    Se llena desde Simulation.create_order y se mantiene al día con
+    Simulation.start_order / complete_order. Los timestamps son segundos
+    epoch (NaN si no hay fecha).
+    """
+
+    def __init__(self, route_table):
+        self.route_table = route_table
+        self.order_ids = []
+        self._rows = {}  # order_id -> fila, solo de órdenes no entregadas
+        self.client_ids = []  # código -> client_id
+        self._client_codes = {}
+
+        self.client = _Column(np.int32)
+        self.origin = _Column(np.int32)
+        self.destination = _Column(np.int32)
+        self.priority = _Column(np.int32)
+        self.cost = _Column(np.float64)
+        self.created_at = _Column(np.float64)
+        self.delivered_at = _Column(np.float64)
+        self.status = _Column(np.int8)
+        self.path_offsets = _Column(np.int64)
+        self.path_offsets.append(0)
+        self.path_ids = _Column(np.int32, capacity=256)
+
+    # Columnas numéricas, en el orden en que se guardan en disco
+    COLUMNS = ("client", "origin", "destination", "priority", "cost", "created_at",
+               "delivered_at", "status", "path_offsets", "path_ids")
+
+    @classmethod
+    def from_columns(cls, route_table, columns, order_ids, client_ids):
+        """
+        Store armado sobre arreglos ya existentes (dict nombre -> arreglo con
+        las COLUMNS), sin copiarlos: sirve para abrir un escenario guardado con
+        memmap. Los vértices de origin/destination/path_ids son ids de route_table.
+        """
+        store = cls.__new__(cls)
+        store.route_table = route_table
+        store.order_ids = list(order_ids)
+        store._rows = None  # se arma al primer append/update
+        store.client_ids = list(client_ids)
+        store._client_codes = {c: i for i, c in enumerate(store.client_ids)}
+        for name in cls.COLUMNS:
+            setattr(store, name, _Column.wrap(columns[name]))
+        return store
+
+    def __len__(self):
+        return len(self.order_ids)
+
+    def _client_code(self, client_id):
+        code = self._client_codes.get(client_id)
+        if code is None:
+            code = self._client_codes[client_id] = len(self.client_ids)
+            self.client_ids.append(client_id)
+        return code
+
+    def client_code(self, client_id):
+        """Código entero del cliente en la columna client, o None si no tiene órdenes."""
+        return self._client_codes.get(client_id)
+
+    def _index(self):
+        # Solo las órdenes que aún pueden cambiar (no entregadas) tienen entrada
+        if self._rows is None:
+            vivas = np.flatnonzero(self.status.view() != _STATUS_CODE["delivered"]).tolist()
+            self._rows = {self.order_ids[row]: row for row in vivas}
+        return self._rows
+
+    def append(self, order):
+        vid = self.route_table.vertex_id
+        self._index()[order.order_id] = len(self.order_ids)
+        self.order_ids.append(order.order_id)
+        self.client.append(self._client_code(order.client_id))
+        self.origin.append(vid(order.origin))
+        self.destination.append(vid(order.destination))
+        self.priority.append(order.priority)
+        self.cost.append(order.total_cost)
+        self.created_at.append(_epoch(order.created_at))
+        self.delivered_at.append(_epoch(order.delivered_at))
+        self.status.append(_STATUS_CODE[order.status])
+        if order.route_table is self.route_table:
+            self.path_ids.extend(order.path_key)  # ya son ids de la tabla
+        else:
+            self.path_ids.extend([vid(v) for v in order.path])
+        self.path_offsets.append(self.path_ids.n)
+
+    def update(self, order):
+        """Copia estado, costo y fechas de la orden a su fila (la entregada sale del índice)."""
+        rows = self._index()
+        row = rows[order.order_id] if order.status != "delivered" else rows.pop(order.order_id)
+        self.status.data[row] = _STATUS_CODE[order.status]
+        self.cost.data[row] = order.total_cost
+        self.created_at.data[row] = _epoch(order.created_at)
+        self.delivered_at.data[row] = _epoch(order.delivered_at)
+
+    # ----- Lectura -----
+    def path_ids_of(self, row):
+        offsets = self.path_offsets.data
+        return self.path_ids.data[offsets[row]:offsets[row + 1]]
+
+    def iter_paths(self):
+        """Genera la ruta de cada orden como lista de vértices."""
+        vertex = self.route_table.vertex
+        for row in range(len(self)):
+            yield [vertex(i) for i in self.path_ids_of(row).tolist()]
+
+    def rows(self, start=0, stop=None):
+        """Genera las órdenes como dicts (mismo formato que Order.to_dict), sin materializar la lista."""
+        vertex = self.route_table.vertex
+        for row in range(start, len(self) if stop is None else min(stop, len(self))):
+            client_id = self.client_ids[self.client.data[row]]
+            delivered = self.delivered_at.data[row]
+            yield {
+                "order_id": self.order_ids[row],
+                "client": f"Cliente{client_id[-1]}",
+                "client_id": client_id,
+                "origin": str(vertex(self.origin.data[row])),
+                "destination": str(vertex(self.destination.data[row])),
+                "priority": int(self.priority.data[row]),
+                "status": STATUSES[self.status.data[row]],
+                "created_at": _iso(self.created_at.data[row]),
+                "delivered_at": _iso(delivered),
+                "route_cost": float(self.cost.data[row]),
+                "path": [str(vertex(i)) for i in self.path_ids_of(row).tolist()],
+            }
+
+    def __iter__(self):
+        return self.rows()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step == 1:
+                return list(self.rows(start, stop))
+            return [next(self.rows(i, i + 1)) for i in range(start, stop, step)]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return next(self.rows(key, key + 1))
+
+    def to_pandas(self):
+        """
+        DataFrame con las columnas numéricas como vistas de los arreglos (sin
+        copia); clientes y vértices como Categorical sobre los mismos códigos.
+        La ruta queda en path_start/path_end sobre path_ids.
+        """
+        import pandas as pd
+
+        labels = self.route_table.vertex_labels()
+        offsets = self.path_offsets.view()
+        return pd.DataFrame({
+            "order_id": self.order_ids,
+            "client_id": pd.Categorical.from_codes(self.client.view(), self.client_ids),
+            "origin": pd.Categorical.from_codes(self.origin.view(), labels),
+            "destination": pd.Categorical.from_codes(self.destination.view(), labels),
+            "priority": self.priority.view(),
+            "status": pd.Categorical.from_codes(self.status.view(), STATUSES),
+            "created_at": pd.to_datetime(self.created_at.view(), unit="s", utc=True),
+            "delivered_at": pd.to_datetime(self.delivered_at.view(), unit="s", utc=True),
+            "route_cost": self.cost.view(),
+            "path_start": offsets[:-1],
+            "path_end": offsets[1:],
+        }, copy=False)
+
+    def to_arrow(self):
+        """
+        Tabla de pyarrow: columnas numéricas sin copia, diccionarios para
+        clientes/vértices/estado y la ruta como lista de ids de vértice
+        armada directamente sobre path_offsets y path_ids.
+        """
+        import pyarrow as pa
+
+        labels = pa.array(self.route_table.vertex_labels())
+        return pa.table({
+            "order_id": pa.array(self.order_ids),
+            "client_id": pa.DictionaryArray.from_arrays(self.client.view(), pa.array(self.client_ids)),
+            "origin": pa.DictionaryArray.from_arrays(self.origin.view(), labels),
+            "destination": pa.DictionaryArray.from_arrays(self.destination.view(), labels),
+            "priority": pa.array(self.priority.view()),
+            "status": pa.DictionaryArray.from_arrays(self.status.view(), pa.array(STATUSES)),
+            "created_at": pa.array(self.created_at.view()),
+            "delivered_at": pa.array(self.delivered_at.view(), from_pandas=True),
+            "route_cost": pa.array(self.cost.view()),
+            # Offsets de 64 bits: lista "large" de Arrow
+            "path": pa.LargeListArray.from_arrays(self.path_offsets.view(), self.path_ids.view()),
+        })
+
+
+def _epoch(ts):
+    # Las órdenes guardan segundos epoch; se aceptan también datetime
+    if ts is None:
+        return np.nan
+    return ts.timestamp() if isinstance(ts, datetime) else ts
+
+
+def _iso(ts):
+    return None if np.isnan(ts) else datetime.fromtimestamp(ts).isoformat()
@@ -0,0 +1,58 @@
+# sim/parallel.py
+#
+# Ruteo de órdenes en paralelo con un pool de procesos. Cada worker recibe la
+# instantánea CSR (solo arreglos numpy) una única vez al iniciar; las tareas
+# viajan como lotes de pares (origen, destino) en ids enteros.
+
+from concurrent.futures import ProcessPoolExecutor
+
+from model.csr import CSRGraph
+from model.shortest_path import route_batch_ids
+
+_csr = None  # instantánea propia de cada proceso worker
+
+
+def _init_worker(indptr, indices, weights, directed):
+    global _csr
+    _csr = CSRGraph.from_arrays(indptr, indices, weights, directed=directed)
+
+
+def _route_chunk(chunk):
+    return route_batch_ids(_csr, chunk)
+
+
+def route_pairs_parallel(csr, pairs, workers, chunk_size=None):
+    """
+    Rutea pares (s, t) de ids sobre csr repartiéndolos entre workers procesos.
+    Los pares con el mismo origen van al mismo lote, para que cada worker
+    calcule un solo árbol por origen.
+    Devuelve [(path de ids, cost) o (None, None), ...] en el orden de pairs.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    if chunk_size is None:
+        # Varios lotes por worker para repartir bien la carga
+        chunk_size = max(1, len(pairs) // (workers * 4))
+
+    by_source = {}
+    for i, (s, _) in enumerate(pairs):
+        by_source.setdefault(s, []).append(i)
+    chunks = [[]]
+    for positions in by_source.values():
+        if len(chunks[-1]) >= chunk_size:
+            chunks.append([])
+        chunks[-1].extend(positions)
+
+    results = [None] * len(pairs)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(csr.indptr, csr.indices, csr.weights, csr.directed),
+    ) as pool:
+        partes = pool.map(_route_chunk, [[pairs[i] for i in chunk] for chunk in chunks])
+        # Cada resultado vuelve a su posición original: el orden es determinista
+        for chunk, part in zip(chunks, partes):
+            for i, result in zip(chunk, part):
+                results[i] = result
+    return results
@@ -0,0 +1,268 @@
+# sim/persistence.py
+#
+# Escenarios guardados en disco: una carpeta con un .npy por arreglo y un
+# manifest.json. Se usan .npy sueltos (no un .npz) porque np.load solo puede
+# abrirlos con memmap: al cargar, el CSR y las columnas de órdenes quedan
+# mapeados en modo copy-on-write ("c") y el sistema operativo lee del disco
+# solo las páginas que se tocan. Las escrituras posteriores (pesos nuevos,
+# órdenes entregadas) van a memoria y nunca modifican los archivos.
+
+import gc
+import itertools
+import json
+import os
+
+import numpy as np
+
+from dominio.order import Order, OrderStatus
+from model.csr import CSRGraph
+from model.graph import Graph
+from model.nodes import Node, Role
+from TDA.hash_map import HashMap
+from simulacion.order_store import OrderStore, STATUSES
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+ROLES = tuple(Role)
+
+
+def save_scenario(sim, path):
+    """
+    Guarda el grafo de sim y su estado (órdenes en columnas, clientes, rutas
+    del AVL y visitas por nodo) en la carpeta path. El manifest se escribe al
+    final, así una carpeta a medio escribir no se puede cargar.
+    """
+    os.makedirs(path, exist_ok=True)
+    csr = sim.graph.freeze()
+    nodes = [v.element() for v in csr.vertices]
+    table = sim.route_table
+    store = sim.order_store
+
+    routes = [table.route(rid) for rid in range(len(table))]
+    frequency = dict(sim.routes_avl.items())
+    clients = [c for _, c in sim.clients.items()]
+
+    arrays = {
+        # Grafo
+        "indptr": csr.indptr,
+        "indices": csr.indices,
+        "weights": csr.weights,
+        "node_label": np.array([n.label for n in nodes], dtype=str),
+        "node_id": np.array([n.id for n in nodes], dtype=str),
+        "node_role": np.array([ROLES.index(n.role) for n in nodes], dtype=np.int8),
+        "node_lat": np.array([np.nan if n.lat is None else n.lat for n in nodes], dtype=np.float64),
+        "node_lon": np.array([np.nan if n.lon is None else n.lon for n in nodes], dtype=np.float64),
+        # Rutas internadas (ids de la RouteTable) y su frecuencia en el AVL
+        "route_vertices": np.array([csr.index[table.vertex(i)] for i in range(table.num_vertices())], dtype=np.int32),
+        "route_offsets": np.cumsum([0] + [len(key) for key in routes], dtype=np.int64),
+        "route_ids": np.fromiter((i for key in routes for i in key), dtype=np.int32),
+        "route_freq": np.array([frequency.get(key, 0) for key in routes], dtype=np.int64),
+        # Clientes
+        "client_id": np.array([c.client_id for c in clients], dtype=str),
+        "client_name": np.array([c.name for c in clients], dtype=str),
+        "client_type": np.array([c.client_type for c in clients], dtype=str),
+        # Órdenes
+        "order_id": np.array(store.order_ids, dtype=str),
+        "order_client_id": np.array(store.client_ids, dtype=str),
+        "visits": np.array([sim.analytics.visits.get(v, 0) for v in csr.vertices], dtype=np.int64),
+    }
+    for name in OrderStore.COLUMNS:
+        arrays["order_" + name] = getattr(store, name).view()
+
+    for name, array in arrays.items():
+        np.save(os.path.join(path, name + ".npy"), array)
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "directed": csr.directed,
+        "vertices": csr.num_vertices(),
+        "edges": csr.num_edges(),
+        "orders": len(store),
+        "routes": len(routes),
+        "order_counter": sim.order_counter,
+        "arrays": sorted(arrays),
+    }
+    tmp = os.path.join(path, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(path, MANIFEST))
+    return manifest
+
+
+def load_scenario(path, mmap=True):
+    """
+    Abre un escenario guardado con save_scenario y devuelve (graph, sim),
+    igual que generar_red. Con mmap los arreglos se mapean en vez de leerse.
+    El grafo se arma de una vez desde el CSR de disco (Graph.from_edges) y
+    ese mismo CSR mapeado queda como su instantánea. Como en la simulación en
+    vivo, solo las órdenes pendientes o en tránsito están en sim.orders, y
+    cada objeto Order se arma desde su fila recién cuando se pide; el
+    historial de entregadas queda en las columnas de sim.order_store
+    (get_orders / iter_orders).
+    """
+    from simulacion.simulation import Simulation
+
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Formato de escenario no soportado: {manifest.get('format')}")
+    mode = "c" if mmap else None
+
+    def load(name):
+        return np.load(os.path.join(path, name + ".npy"), mmap_mode=mode)
+
+    indptr, indices, weights = load("indptr"), load("indices"), load("weights")
+    directed = manifest["directed"]
+
+    # Mismo truco que generar_red: la construcción no crea ciclos
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        lat, lon = load("node_lat").tolist(), load("node_lon").tolist()
+        nodes = [Node(label, ROLES[role], node_id, None if a != a else a, None if b != b else b)
+                 for label, node_id, role, a, b in zip(load("node_label").tolist(), load("node_id").tolist(),
+                                                       load("node_role").tolist(), lat, lon)]
+        sources = np.repeat(np.arange(len(nodes)), np.diff(indptr))
+        # Sin dirección cada arista aparece en las dos filas: se toma una vez
+        keep = slice(None) if directed else sources <= indices
+        graph = Graph.from_edges(nodes, sources[keep], indices[keep], weights[keep], directed=directed)
+        vertices = list(graph.vertices())
+        graph._vertices_list = vertices
+
+        # La instantánea CSR es la de disco (mapeada), sin reconstruirla
+        graph._frozen = CSRGraph.from_arrays(indptr, indices, weights, directed=directed,
+                                             vertices=vertices, version=graph.version())
+
+        sim = Simulation(graph)
+        table = sim.route_table
+        for i in load("route_vertices").tolist():
+            table.vertex_id(vertices[i])
+        offsets, ids = load("route_offsets").tolist(), load("route_ids").tolist()
+        keys = [table.intern_ids(tuple(ids[offsets[r]:offsets[r + 1]])) for r in range(len(offsets) - 1)]
+        runs = sorted((key, freq) for key, freq in zip(keys, load("route_freq").tolist()) if freq)
+        sim.routes_avl.bulk_insert_counts(runs)
+
+        store = OrderStore.from_columns(
+            table, {name: load("order_" + name) for name in OrderStore.COLUMNS},
+            load("order_id").tolist(), load("order_client_id").tolist())
+        sim.order_store = store
+        sim.order_counter = manifest["order_counter"]
+
+        for client_id, name, client_type in zip(load("client_id").tolist(), load("client_name").tolist(),
+                                                load("client_type").tolist()):
+            sim.register_client(client_id, name, client_type)
+        _restore_client_orders(sim, store)
+        sim.orders = _LazyOrders(store)
+
+        visits = load("visits").tolist()
+        sim.analytics.restore((v, c) for v, c in zip(vertices, visits) if c)
+    finally:
+        if gc_activo:
+            gc.enable()
+    return graph, sim
+
+
+def _restore_client_orders(sim, store):
+    # client.orders de cada cliente registrado, en orden de creación
+    codes = store.client.view()
+    rows = np.argsort(codes, kind="stable").tolist()
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(store.client_ids))))).tolist()
+    for client_id, client in sim.clients.items():
+        code = store.client_code(client_id)
+        if code is not None:
+            client.orders = [store.order_ids[r] for r in rows[bounds[code]:bounds[code + 1]]]
+
+
+def _build_orders(store, rows):
+    # Columnas leídas de una vez para las filas pedidas: indexar un memmap
+    # fila por fila es mucho más lento que convertir cada columna a lista
+    table = store.route_table
+    rows = np.asarray(rows, dtype=np.int64)
+
+    def column(col):
+        return col.view()[rows].tolist()
+
+    offsets = np.asarray(store.path_offsets.view())
+    ids = np.asarray(store.path_ids.view())
+    estados = [OrderStatus(s) for s in STATUSES]
+    vertex, intern_ids, order_ids, client_ids = table.vertex, table.intern_ids, store.order_ids, store.client_ids
+    orders = []
+    for row, client, origin, destination, priority, created, delivered, code, cost, start, end in zip(
+            rows.tolist(), column(store.client), column(store.origin), column(store.destination),
+            column(store.priority), column(store.created_at), column(store.delivered_at), column(store.status),
+            column(store.cost), offsets[rows].tolist(), offsets[rows + 1].tolist()):
+        order = Order(order_ids[row], client_ids[client], vertex(origin), vertex(destination), priority,
+                      created_at=created, route_table=table)
+        order.path_key = intern_ids(tuple(ids[start:end].tolist()))
+        order.status = estados[code]
+        order.total_cost = cost
+        order.delivered_at = None if delivered != delivered else delivered
+        orders.append(order)
+    return orders
+
+
+class _LazyOrders(HashMap):
+    """
+    sim.orders de un escenario cargado. Las órdenes no entregadas del store
+    ya cuentan como claves, pero su objeto Order se arma desde la fila recién
+    en get() (o todas juntas al recorrer values() / items()), y el índice
+    order_id -> fila recién al primer uso. Cargar no cuesta nada por orden.
+    """
+
+    def __init__(self, store):
+        super().__init__()
+        self._store = store
+        self._live = store.status.view() != STATUSES.index("delivered")
+        self._unbuilt = None  # order_id -> fila, de las vivas que aún no tienen objeto
+
+    def _rows(self):
+        if self._unbuilt is None:
+            order_ids = self._store.order_ids
+            self._unbuilt = {order_ids[row]: row for row in np.flatnonzero(self._live).tolist()}
+        return self._unbuilt
+
+    def _build_all(self):
+        if self._unbuilt is None:
+            rows = np.flatnonzero(self._live)
+        else:
+            rows = list(self._unbuilt.values())
+        self._unbuilt = {}
+        if len(rows):
+            for order in _build_orders(self._store, rows):
+                super().set(order.order_id, order)
+
+    def set(self, key, value):
+        self._rows().pop(key, None)
+        super().set(key, value)
+
+    def get(self, key):
+        order = super().get(key)
+        if order is None:
+            row = self._rows().pop(key, None)
+            if row is not None:
+                order = _build_orders(self._store, [row])[0]
+                super().set(key, order)
+        return order
+
+    def remove(self, key):
+        if self._rows().pop(key, None) is not None:
+            return True
+        return super().remove(key)
+
+    def contains(self, key):
+        return key in self._rows() or super().contains(key)
+
+    def keys(self):
+        return itertools.chain(super().keys(), list(self._rows()))
+
+    def values(self):
+        self._build_all()
+        return super().values()
+
+    def items(self):
+        self._build_all()
+        return super().items()
+
+    def __len__(self):
+        pending = int(self._live.sum()) if self._unbuilt is None else len(self._unbuilt)
+        return super().__len__() + pending
@@ -0,0 +1,101 @@
+# sim/route_cache.py
+
+from TDA.lru_cache import LRUCache
+
+
+class RouteCache:
+    """
+    Caché LRU de rutas calculadas, por (id origen, id destino, algoritmo,
+    autonomía). Los valores son siempre (tupla de ids, costo), o (None, costo)
+    sin ruta; los ids son los de la instantánea CSR del grafo y quien muestra
+    la ruta la traduce a vértices.
+    Se registra como observador del grafo: las entradas valen para la versión
+    guardada en self.version y se invalidan justo cuando una mutación puede
+    cambiar rutas (insertar o quitar aristas, quitar vértices). Insertar un
+    vértice aislado no cambia ninguna ruta ni los ids existentes, y un cambio
+    de peso solo desaloja las entradas que pudo afectar.
+    """
+
+    def __init__(self, graph, maxsize=4096, ttl=None):
+        self._graph = graph
+        self._lru = LRUCache(maxsize, ttl)
+        self.version = graph.version()
+        self.invalidations = 0
+        self.selective_evictions = 0
+        graph.add_observer(self)
+
+    def _key(self, origin, destination, algorithm, max_autonomia):
+        index = self._graph.freeze().index
+        return (index[origin], index[destination], algorithm, max_autonomia)
+
+    def _check_version(self):
+        # Las claves no llevan la versión: sin los eventos del grafo el
+        # desalojo selectivo no vería los cambios de peso
+        assert self._graph.has_observer(self), "RouteCache ya no observa su grafo"
+        # Red de seguridad si el grafo cambió sin notificar
+        if self.version != self._graph.version():
+            self.invalidate()
+
+    def get(self, origin, destination, algorithm="Dijkstra", max_autonomia=None):
+        """Ruta cacheada entre dos vértices, o None si no está."""
+        self._check_version()
+        return self._lru.get(self._key(origin, destination, algorithm, max_autonomia))
+
+    def set(self, origin, destination, value, algorithm="Dijkstra", max_autonomia=None):
+        self._check_version()
+        self._lru.set(self._key(origin, destination, algorithm, max_autonomia), value)
+
+    def get_ids(self, s, t, algorithm="Dijkstra", max_autonomia=None):
+        """Como get, con ids de la instantánea CSR ya resueltos."""
+        self._check_version()
+        return self._lru.get((s, t, algorithm, max_autonomia))
+
+    def set_ids(self, s, t, value, algorithm="Dijkstra", max_autonomia=None):
+        self._check_version()
+        self._lru.set((s, t, algorithm, max_autonomia), value)
+
+    def invalidate(self):
+        self._lru.clear()
+        self.invalidations += 1
+        self.version = self._graph.version()
+
+    def stats(self):
+        stats = self._lru.stats()
+        stats["invalidations"] = self.invalidations
+        stats["selective_evictions"] = self.selective_evictions
+        return stats
+
+    # ----- Eventos del grafo -----
+    def vertex_inserted(self, graph, v):
+        self.version = graph.version()
+
+    def vertex_removed(self, graph, v):
+        self.invalidate()
+
+    def edge_inserted(self, graph, e):
+        self.invalidate()
+
+    def edge_removed(self, graph, e):
+        self.invalidate()
+
+    def edge_weight_updated(self, graph, e, old):
+        if self.version != graph.version() - 1:
+            # La caché ya estaba desfasada antes de este cambio
+            self.invalidate()
+            return
+        # Los ids CSR no cambian con un cambio de peso: las claves siguen valiendo
+        new = e.element()
+        if new > old:
+            # Solo empeoran las rutas que pasan por la arista
+            u, v = e.endpoints()
+            index = graph.freeze().index
+            arcos = {(index[u], index[v])}
+            if not graph.is_directed():
+                arcos.add((index[v], index[u]))
+            stale = lambda key, value: value[0] is not None and any(
+                (a, b) in arcos for a, b in zip(value[0], value[0][1:]))
+        else:
+            # Una ruta más cara que el peso nuevo podría mejorar pasando por la arista
+            stale = lambda key, value: value[1] is None or value[1] > new
+        self.selective_evictions += self._lru.remove_if(stale)
+        self.version = graph.version()
@@ -0,0 +1,147 @@
+# sim/run.py
+#
+# Simulación por lotes sin interfaz (no importa streamlit, matplotlib ni plotly).
+# Uso (desde la carpeta Proyecto):
+#   python -m simulacion.run --nodes 150 --edges 300 --orders 100000 --seed 7 --out resultados --workers 8
+#   python -m simulacion.run --orders 1000 --dispatch almacen
+#   python -m simulacion.run --orders 100000 --drones 20 --arrival-rate 2
+#   python -m simulacion.run --orders 5000 --dispatch almacen --tours 30
+#   python -m simulacion.run --orders 1000000 --save   (escenario en resultados/escenario)
+#   python -m simulacion.run --orders 100000 --drones 20 --journal   (eventos en resultados/orders.journal)
+
+import argparse
+import csv
+import json
+import os
+import random
+import time
+
+from simulacion.engine import EventEngine
+from simulacion.init_simulation import generar_red, registrar_clientes, generar_ordenes
+from simulacion.journal import OrderJournal
+from simulacion.persistence import save_scenario
+
+
+def run(n_nodes, m_edges, n_orders, seed=None, out_dir="resultados", workers=1, dispatch="cliente",
+        drones=0, arrival_rate=1.0, tours=None, save=False, journal=False):
+    """Genera la red, registra clientes, crea las órdenes y escribe los resultados."""
+    random.seed(seed)
+
+    # Misma distribución de roles que el dashboard: 20% / 20% / 60%
+    n_almacen = int(n_nodes * 0.20)
+    n_recarga = int(n_nodes * 0.20)
+    n_clientes = n_nodes - n_almacen - n_recarga
+
+    t0 = time.perf_counter()
+    graph, sim = generar_red(n_nodes, m_edges, n_almacen, n_recarga, n_clientes, seed=seed)
+    # Registro durable de cada evento de las órdenes (JournalReader.replay lo reproduce)
+    ruta_journal = os.path.join(out_dir, "orders.journal") if journal else None
+    if ruta_journal:
+        os.makedirs(out_dir, exist_ok=True)
+        # Como orders.csv, cada corrida reemplaza el registro anterior
+        for viejo in (ruta_journal, ruta_journal + ".paths"):
+            if os.path.exists(viejo):
+                os.remove(viejo)
+        sim.journal = OrderJournal(ruta_journal, graph)
+    t1 = time.perf_counter()
+    registrar_clientes(sim, n_clientes)
+    generar_ordenes(sim, n_orders, workers=workers, despacho=dispatch)
+    t2 = time.perf_counter()
+
+    # Vuelos de varias paradas para las órdenes pendientes (antes de entregarlas)
+    plan = sim.plan_tours(capacity=tours).summary() if tours else None
+
+    # Entregas con el motor de eventos: llegadas de Poisson (arrival_rate por minuto)
+    entregas = None
+    if drones > 0:
+        engine = EventEngine(sim, n_drones=drones)
+        engine.submit_all(sim.orders.values(), lambda: random.expovariate(arrival_rate))
+        entregas = engine.run()
+    if sim.journal is not None:
+        sim.journal.close()
+    t3 = time.perf_counter()
+
+    os.makedirs(out_dir, exist_ok=True)
+    _escribir_ordenes(sim, os.path.join(out_dir, "orders.csv"))
+    # Escenario binario para reabrirlo (dashboard o load_scenario) sin regenerarlo
+    escenario = os.path.join(out_dir, "escenario") if save else None
+    if escenario:
+        save_scenario(sim, escenario)
+
+    resumen = {
+        "seed": seed,
+        "nodes": n_nodes,
+        "edges": m_edges,
+        "orders_requested": n_orders,
+        "orders_created": sim.order_counter - 1,
+        "clients": n_clientes,
+        "unique_routes": len(sim.routes_avl),
+        "top_routes": sim.get_top_routes(10),
+        "network_seconds": round(t1 - t0, 4),
+        "orders_seconds": round(t2 - t1, 4),
+        "workers": workers,
+        "dispatch": dispatch,
+        "tours": plan,
+        "delivery": entregas,
+        "delivery_seconds": round(t3 - t2, 4),
+        "scenario": escenario,
+        "journal": ruta_journal,
+    }
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(resumen, f, ensure_ascii=False, indent=2)
+
+    return resumen
+
+
+def _escribir_ordenes(sim, ruta):
+    campos = ["order_id", "client_id", "origin", "destination", "priority",
+              "status", "created_at", "delivered_at", "route_cost", "path"]
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=campos, extrasaction="ignore")
+        writer.writeheader()
+        for fila in sim.iter_orders():
+            fila["path"] = " → ".join(fila["path"])
+            writer.writerow(fila)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación de la red de drones sin interfaz gráfica.")
+    parser.add_argument("--nodes", type=int, default=15, help="número de nodos")
+    parser.add_argument("--edges", type=int, default=20, help="número de aristas (incluye la cadena base)")
+    parser.add_argument("--orders", type=int, default=10, help="número de órdenes a generar")
+    parser.add_argument("--seed", type=int, default=None, help="semilla para reproducir la simulación")
+    parser.add_argument("--out", default="resultados", help="carpeta de salida")
+    parser.add_argument("--workers", type=int, default=1, help="procesos para rutear órdenes en paralelo")
+    parser.add_argument("--dispatch", choices=["cliente", "almacen"], default="cliente",
+                        help="origen de las órdenes: otro cliente o el almacén más cercano")
+    parser.add_argument("--drones", type=int, default=0, help="drones para simular las entregas (0: no simular)")
+    parser.add_argument("--arrival-rate", type=float, default=1.0, help="órdenes que llegan por minuto simulado")
+    parser.add_argument("--tours", type=float, default=None,
+                        help="agrupar órdenes en vuelos con esta autonomía en km (usa Floyd-Warshall)")
+    parser.add_argument("--save", action="store_true",
+                        help="guardar el escenario (grafo y órdenes) en <out>/escenario para reabrirlo")
+    parser.add_argument("--journal", action="store_true",
+                        help="registrar los eventos de las órdenes en <out>/orders.journal")
+    args = parser.parse_args(argv)
+
+    if args.edges < args.nodes - 1:
+        parser.error("--edges debe ser al menos --nodes - 1 para que la red sea conexa")
+    if args.edges > args.nodes * (args.nodes - 1):
+        parser.error("--edges no puede superar --nodes * (--nodes - 1)")
+    if args.arrival_rate <= 0:
+        parser.error("--arrival-rate debe ser positivo")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    resumen = run(args.nodes, args.edges, args.orders, seed=args.seed, out_dir=args.out,
+                  workers=args.workers, dispatch=args.dispatch,
+                  drones=args.drones, arrival_rate=args.arrival_rate, tours=args.tours, save=args.save,
+                  journal=args.journal)
+    print(f"{resumen['orders_created']} órdenes en {resumen['orders_seconds']} s "
+          f"({resumen['unique_routes']} rutas únicas) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
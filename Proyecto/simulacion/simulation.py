@@ -2,60 +2,183 @@
 
 from dominio.order import Order
 from dominio.client import Client
-from dominio.route import Route
+from dominio.route import RouteTable
 from TDA.avl import AVLTree
 from TDA.hash_map import HashMap
+from model.assignment import nearest_warehouse
 from model.graph import Graph
+from model.shortest_path import route_batch_ids
+from simulacion.analytics import VisitAnalytics
+from simulacion.dispatcher import plan_dispatch
+from simulacion.journal import OrderJournal
+from simulacion.order_store import OrderStore
+from simulacion.parallel import route_pairs_parallel
+from simulacion.route_cache import RouteCache
 
 class Simulation:
-    def __init__(self, graph: Graph):
+    def __init__(self, graph: Graph, journal=None):
         self.graph = graph
-        self.orders = HashMap()
+        self.orders = HashMap()  # órdenes vivas (pendientes o en vuelo); las entregadas quedan en order_store
         self.clients = HashMap()
         self.routes_avl = AVLTree()
+        self.route_table = RouteTable()  # rutas como tuplas de ids enteros
+        self.order_store = OrderStore(self.route_table)  # vista en columnas de las órdenes
+        self.analytics = VisitAnalytics(graph)  # visitas por nodo, al día en cada orden
         self.order_counter = 1
+        self.route_cache = RouteCache(graph)  # se invalida con las mutaciones del grafo
+        # Registro durable de órdenes (OrderJournal o ruta del archivo); None: solo en memoria
+        if isinstance(journal, str):
+            journal = OrderJournal(journal, graph)
+        self.journal = journal
 
     def register_client(self, client_id, name, client_type="premium"):
         if not self.clients.contains(client_id):
             client = Client(client_id, name, client_type)
             self.clients.set(client_id, client)
 
-    def create_order(self, client_id, origin, destination, priority, path, cost):
-        order_id = f"ORD{self.order_counter}"
-        self.order_counter += 1
+    def route_orders(self, pairs, workers=1):
+        """
+        Rutea una lista de pares (origen, destino) de vértices. Los pares se
+        agrupan por origen y se calcula un solo árbol de caminos mínimos por
+        origen distinto. Con workers > 1 los grupos se reparten en un pool de
+        procesos que reciben la instantánea CSR una sola vez.
+        Devuelve [(path, cost), ...] en el mismo orden que pairs, con
+        (None, None) si no hay ruta.
+        """
+        csr = self.graph.freeze()
+        ids = [(csr.index[o], csr.index[d]) for o, d in pairs]
+
+        # Solo se calculan los pares que no están en la caché de rutas
+        results = [self.route_cache.get_ids(s, t) for s, t in ids]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            pending = [ids[i] for i in missing]
+            if workers > 1:
+                computed = route_pairs_parallel(csr, pending, workers)
+            else:
+                computed = route_batch_ids(csr, pending)
+            for i, (path, cost) in zip(missing, computed):
+                results[i] = (tuple(path), cost) if path else (None, None)
+                self.route_cache.set_ids(*ids[i], results[i])
+
+        # Pares con la misma ruta comparten la lista de vértices
+        vertices = csr.vertices
+        paths = {}
+        for path, _ in results:
+            if path and path not in paths:
+                paths[path] = [vertices[i] for i in path]
+        return [(paths[path], cost) if path else (None, None) for path, cost in results]
+
+    def create_orders_batch(self, requests, workers=1):
+        """
+        Crea órdenes pendientes en lote. requests: (client_id, origin,
+        destination, priority). Todas se rutean juntas con route_orders y
+        las que no tienen ruta se descartan. Devuelve las órdenes creadas.
+        """
+        requests = list(requests)
+        routes = self.route_orders([(o, d) for _, o, d, _ in requests], workers=workers)
+        orders = []
+        for (client_id, origin, destination, priority), (path, cost) in zip(requests, routes):
+            if path:
+                orders.append(self.create_order(client_id, origin, destination, priority, path, cost))
+        return orders
+
+    def nearest_warehouse(self, vertex):
+        """
+        (almacén, cost) más cercano a vertex por costo de ruta, o (None, None).
+        La asignación de todos los vértices se calcula una vez por versión del
+        grafo, así cada consulta es O(1).
+        """
+        assignment = nearest_warehouse(self.graph)
+        warehouse = assignment.warehouse(vertex)
+        if warehouse is None:
+            return None, None
+        return warehouse, assignment.cost(vertex)
+
+    def dispatch_orders(self, requests):
+        """
+        Crea órdenes despachadas desde el almacén más cercano a cada destino.
+        requests: (client_id, destination, priority). La ruta sale del árbol
+        multi-origen ya calculado, sin una búsqueda por orden. Los destinos
+        que ningún almacén alcanza se descartan. Devuelve las órdenes creadas.
+        """
+        assignment = nearest_warehouse(self.graph)
+        orders = []
+        for client_id, destination, priority in requests:
+            path, cost = assignment.route(destination)
+            if path:
+                orders.append(self.create_order(client_id, path[0], destination, priority, path, cost))
+        return orders
+
+    def create_order(self, client_id, origin, destination, priority, path, cost, order_id=None, created_at=None):
+        # order_id / created_at: solo para reconstruir órdenes ya registradas (JournalReader.replay)
+        if order_id is None:
+            order_id = f"ORD{self.order_counter}"
+            self.order_counter += 1
+        elif order_id[3:].isdigit():
+            self.order_counter = max(self.order_counter, int(order_id[3:]) + 1)
 
         # Crear orden SIN marcarla como entregada aún
-        order = Order(order_id, client_id, origin, destination, priority, path=path)
+        # La ruta queda internada en route_table: las órdenes con la misma ruta comparten la tupla
+        order = Order(order_id, client_id, origin, destination, priority, path=path,
+                      created_at=created_at, route_table=self.route_table)
         order.total_cost = cost
         self.orders.set(order_id, order)
+        self.order_store.append(order)
+        self.analytics.record(path)
 
         client = self.clients.get(client_id)
         if client:
             client.add_order(order_id)
 
         # Registrar la ruta en el árbol AVL
-        route = Route(path, cost)
-        self.routes_avl.insert(route.to_key())
+        self.routes_avl.insert(order.path_key)
+
+        if self.journal is not None:
+            self.journal.order_created(order)
 
         return order
 
+    def plan_tours(self, capacity=50, max_stops=None):
+        # Agrupa las órdenes pendientes en vuelos de varias paradas (DispatchPlan)
+        return plan_dispatch(self, capacity, max_stops)
+
+    def receive_order(self, order, at):
+        # La orden entra al sistema en la fecha (simulada) at, en segundos epoch
+        order.created_at = at
+        self.order_store.update(order)
+        if self.journal is not None:
+            self.journal.order_received(order)
+
+    def start_order(self, order):
+        order.start_delivery()
+        self.order_store.update(order)
+        if self.journal is not None:
+            self.journal.order_started(order)
+
+    def complete_order(self, order, cost, at=None):
+        # Marca la orden como entregada; at es la fecha (simulada) de entrega, en segundos epoch
+        order.complete_delivery(cost, delivered_at=at)
+        self.order_store.update(order)
+        if self.journal is not None:
+            self.journal.order_delivered(order)
+        # Entregada ya no cambia: su historial se sirve desde las columnas
+        self.orders.remove(order.order_id)
+
+    def iter_orders(self):
+        # Órdenes como dicts generados uno a uno desde las columnas
+        return self.order_store.rows()
+
     def get_orders(self):
-        return [o.to_dict() for _, o in self.orders.items()]
+        return list(self.order_store.rows())
 
     def get_clients(self):
         return [c.to_dict() for _, c in self.clients.items()]
 
     def get_frequent_routes(self):
-        result = []
-
-        def _inorder(node):
-            if not node:
-                return
-            _inorder(node.left)
-            route_str = " → ".join(node.key)
-            result.append((route_str, node.value))
-            _inorder(node.right)
-
-        _inorder(self.routes_avl.root)
-        return result
+        # Todas las rutas en orden de clave (recorrido inorden del AVL)
+        return [(self.route_table.label(key), freq) for key, freq in self.routes_avl.items()]
 
+    def get_top_routes(self, k):
+        # Las k rutas más frecuentes, leídas del índice de frecuencias del AVL
+        return [(self.route_table.label(key), freq) for key, freq in self.routes_avl.top_k(k)]
@@ -0,0 +1,60 @@
+# tests/test_avl.py
+
+import random
+from collections import Counter
+
+import pytest
+
+from TDA.avl import AVLTree
+
+
+def _check(node):
+    # Devuelve la altura del subárbol verificando orden, alturas y balance
+    if node is None:
+        return 0
+    left, right = _check(node.left), _check(node.right)
+    assert node.left is None or node.left.key < node.key
+    assert node.right is None or node.right.key > node.key
+    assert node.height == 1 + max(left, right)
+    assert abs(left - right) <= 1
+    return node.height
+
+
+def _top(counts, k):
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_insert_remove_against_counter(seed):
+    rng = random.Random(seed)
+    tree, counts = AVLTree(), Counter()
+    for _ in range(2000):
+        key = rng.randrange(300)
+        if rng.random() < 0.25:
+            assert tree.remove(key) == (key in counts)
+            counts.pop(key, None)
+        else:
+            count = rng.randint(1, 3)
+            tree.insert(key, count)
+            counts[key] += count
+    _check(tree.root)
+    assert list(tree.items()) == sorted(counts.items())
+    assert len(tree) == len(counts)
+    assert all(tree.get(key) == value for key, value in counts.items())
+    for k in (0, 1, 5, 50, 1000):
+        assert tree.top_k(k) == _top(counts, k)
+
+
+def test_bulk_insert_merges_and_keeps_top_k():
+    rng = random.Random(7)
+    first = [tuple(rng.randrange(5) for _ in range(3)) for _ in range(500)]
+    second = [tuple(rng.randrange(5) for _ in range(3)) for _ in range(500)]
+    tree = AVLTree()
+    tree.bulk_insert(first)
+    tree.bulk_insert(second)
+    for key in second[:50]:
+        tree.insert(key)
+    counts = Counter(first) + Counter(second) + Counter(second[:50])
+    _check(tree.root)
+    assert list(tree.items()) == sorted(counts.items())
+    assert tree.top_k(10) == _top(counts, 10)
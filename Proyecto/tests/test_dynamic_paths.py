@@ -0,0 +1,67 @@
+# tests/test_dynamic_paths.py
+
+import random
+
+import numpy as np
+import pytest
+
+from model.all_pairs import AllPairsShortestPaths, all_pairs
+from model.shortest_path import dijkstra
+from model.dynamic_paths import pending_changes, repair_tree
+from model.spatial import distancia_km
+from simulacion.init_simulation import generar_red
+
+
+def _change_weights(graph, rng, edges, k):
+    # Sube o baja k pesos, sin bajar de la distancia en línea recta
+    for e in rng.sample(edges, k):
+        u, v = e.endpoints()
+        graph.update_edge_weight(u, v, max(distancia_km(u, v), round(e.element() * rng.uniform(0.2, 4), 2)))
+
+
+def _check_pred(csr, dist, pred, s):
+    # Con empates pred puede diferir de un recálculo; basta con que cada
+    # predecesor sea una arista real que alcance la distancia
+    indptr, indices, weights = csr.lists()
+    for v in range(len(dist)):
+        p = pred[v]
+        if v == s or dist[v] == np.inf:
+            assert p == -1
+            continue
+        w = min(weights[k] for k in range(indptr[p], indptr[p + 1]) if indices[k] == v)
+        assert dist[p] + w == pytest.approx(dist[v])
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_repair_matrix_matches_full_recompute(seed):
+    rng = random.Random(seed)
+    graph, _ = generar_red(35, 110, 6, 6, 23, seed=seed)
+    edges = sorted(graph.edges(), key=lambda e: tuple(map(str, e.endpoints())))
+    apsp = all_pairs(graph)
+
+    for _ in range(6):
+        _change_weights(graph, rng, edges, 3)
+        assert all_pairs(graph) is apsp  # solo pesos: se repara, no se recalcula
+        fresh = AllPairsShortestPaths(graph)
+        np.testing.assert_allclose(apsp.dist, fresh.dist)
+        csr = graph.freeze()
+        for s in range(csr.num_vertices()):
+            _check_pred(csr, apsp.dist[s], apsp.pred[s], s)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_repair_tree_matches_full_recompute(seed):
+    rng = random.Random(seed)
+    graph, _ = generar_red(60, 200, 8, 8, 44, seed=seed)
+    edges = sorted(graph.edges(), key=lambda e: tuple(map(str, e.endpoints())))
+    csr = graph.freeze()
+    dist, pred = (list(a) for a in dijkstra(csr, 0))
+
+    for _ in range(8):
+        since = csr.version
+        _change_weights(graph, rng, edges, 4)
+        csr = graph.freeze()
+        repair_tree(csr, dist, pred, pending_changes(csr, since))
+        fresh, _ = dijkstra(csr, 0)
+        np.testing.assert_allclose(dist, fresh)
+        _check_pred(csr, dist, pred, 0)
@@ -0,0 +1,61 @@
+# tests/test_graph.py
+
+import random
+
+import pytest
+
+from model.graph import Graph
+
+
+def _adjacency(graph):
+    return [(str(v), [(str(u), str(e)) for u, e in zip(graph.neighbors(v), graph.incident_edges(v))])
+            for v in graph.vertices()]
+
+
+def _incoming(graph):
+    return [(str(v), sorted(str(e) for e in graph.incident_edges(v, outgoing=False))) for v in graph.vertices()]
+
+
+@pytest.mark.parametrize("directed", [True, False])
+@pytest.mark.parametrize("seed", range(30))
+def test_from_edges_matches_insert_edge(directed, seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 25)
+    pairs = set()
+    for _ in range(rng.randint(0, 70)):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if directed or (u != v and (v, u) not in pairs):
+            pairs.add((u, v))
+    pairs = sorted(pairs)
+    rng.shuffle(pairs)
+    weights = [rng.random() for _ in pairs]
+
+    bulk = Graph.from_edges(list(range(n)), [u for u, _ in pairs], [v for _, v in pairs], weights, directed)
+    graph = Graph(directed)
+    vertices = [graph.insert_vertex(i) for i in range(n)]
+    for (u, v), w in zip(pairs, weights):
+        graph.insert_edge(vertices[u], vertices[v], w)
+    assert _adjacency(bulk) == _adjacency(graph)
+    assert bulk.version() == graph.version()
+
+    # Las mutaciones siguen funcionando aunque las entrantes aún no estén indexadas
+    for _ in range(6):
+        if not len(graph.vertices()):
+            break
+        i = rng.randrange(len(graph.vertices()))
+        a, b = list(bulk.vertices())[i], list(graph.vertices())[i]
+        op = rng.choice("vei")
+        if op == "v":
+            bulk.remove_vertex(a)
+            graph.remove_vertex(b)
+        elif op == "e" and graph.degree(b):
+            k = rng.randrange(graph.degree(b))
+            bulk.remove_edge(a, list(bulk.neighbors(a))[k])
+            graph.remove_edge(b, list(graph.neighbors(b))[k])
+        elif op == "i":
+            j = rng.randrange(len(graph.vertices()))
+            if j != i and list(graph.vertices())[j] not in graph.neighbors(b):
+                bulk.insert_edge(a, list(bulk.vertices())[j], 1.0)
+                graph.insert_edge(b, list(graph.vertices())[j], 1.0)
+    assert _adjacency(bulk) == _adjacency(graph)
+    assert _incoming(bulk) == _incoming(graph)
@@ -0,0 +1,76 @@
+# tests/test_persistence.py
+
+import random
+
+import numpy as np
+import pytest
+
+from simulacion.engine import EventEngine
+from simulacion.init_simulation import generar_red, registrar_clientes, generar_ordenes
+from simulacion.persistence import load_scenario, save_scenario
+
+
+@pytest.fixture(scope="module")
+def saved(tmp_path_factory):
+    # Escenario con órdenes pendientes, en vuelo y entregadas
+    random.seed(5)
+    graph, sim = generar_red(60, 200, 12, 12, 36, seed=5)
+    registrar_clientes(sim, 36)
+    generar_ordenes(sim, 400)
+    engine = EventEngine(sim, n_drones=3)
+    engine.submit_all(list(sim.orders.values())[:250])
+    engine.run(until=300)
+    path = str(tmp_path_factory.mktemp("escenario"))
+    save_scenario(sim, path)
+    return graph, sim, path
+
+
+def _edges(graph):
+    return sorted((str(u), str(v), e.element()) for e in graph.edges() for u, v in [e.endpoints()])
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(saved, mmap):
+    graph, sim, path = saved
+    graph2, sim2 = load_scenario(path, mmap=mmap)
+
+    assert [repr(v.element()) for v in graph2.vertices()] == [repr(v.element()) for v in graph.vertices()]
+    assert [(v.element().lat, v.element().lon) for v in graph2.vertices()] == \
+           [(v.element().lat, v.element().lon) for v in graph.vertices()]
+    assert _edges(graph2) == _edges(graph)
+    assert graph2.role_counts() == graph.role_counts()
+    csr, csr2 = graph.freeze(), graph2.freeze()
+    for name in ("indptr", "indices", "weights"):
+        assert np.array_equal(getattr(csr2, name), getattr(csr, name))
+
+    assert sim2.get_orders() == sim.get_orders()
+    assert sim2.get_clients() == sim.get_clients()
+    assert sim2.get_frequent_routes() == sim.get_frequent_routes()
+    assert sim2.get_top_routes(10) == sim.get_top_routes(10)
+    assert sim2.order_counter == sim.order_counter
+    assert dict(sim2.analytics.visits) == dict(sim.analytics.visits)
+
+    # Solo las órdenes vivas quedan como objetos, con el mismo estado
+    assert len(sim2.orders) == len(sim.orders)
+    assert sorted(sim2.orders.keys()) == sorted(sim.orders.keys())
+    assert {k: o.to_dict() for k, o in sim2.orders.items()} == {k: o.to_dict() for k, o in sim.orders.items()}
+
+
+def test_loaded_simulation_keeps_running(saved):
+    graph, sim, path = saved
+    graph2, sim2 = load_scenario(path)
+    live = sorted(sim.orders.keys())
+    first = sim2.orders.get(live[0])
+    assert first is sim2.orders.get(live[0])
+    assert sim2.orders.contains(live[-1]) and not sim2.orders.contains("ORD0")
+
+    engine = EventEngine(sim2, n_drones=4)
+    engine.submit_all(o for o in sim2.orders.values() if o.status == "pending")
+    engine.run()
+    # Quedan solo las que el escenario guardó en vuelo (no se volvieron a enviar)
+    assert {o.status for o in sim2.orders.values()} <= {"in_transit"}
+    assert len(sim2.orders) == sum(r["status"] == "in_transit" for r in sim.iter_orders())
+
+    generar_ordenes(sim2, 10)
+    assert len(sim2.order_store) == len(sim.order_store) + 10
+    assert sim2.orders.contains(f"ORD{sim.order_counter}")
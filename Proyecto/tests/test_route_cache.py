@@ -0,0 +1,44 @@
+# tests/test_route_cache.py
+
+import random
+
+import pytest
+
+from model.shortest_path import route_batch_ids
+from model.spatial import distancia_km
+from simulacion.init_simulation import generar_red
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cached_routes_follow_weight_updates(seed):
+    rng = random.Random(seed)
+    graph, sim = generar_red(40, 140, 8, 8, 24, seed=seed)
+    vertices = list(graph.vertices())
+    pairs = [tuple(rng.sample(vertices, 2)) for _ in range(60)]
+    edges = sorted(graph.edges(), key=lambda e: (str(e.endpoints()[0]), str(e.endpoints()[1])))
+
+    for _ in range(15):
+        sim.route_orders(pairs)
+        e = rng.choice(edges)
+        u, v = e.endpoints()
+        graph.update_edge_weight(u, v, max(distancia_km(u, v), e.element() * rng.uniform(0.3, 3)))
+
+        csr = graph.freeze()
+        fresh = route_batch_ids(csr, [(csr.index[o], csr.index[d]) for o, d in pairs])
+        cached = sim.route_orders(pairs)
+        assert [cost for _, cost in cached] == pytest.approx([cost for _, cost in fresh])
+        for (path, _), (o, d) in zip(cached, pairs):
+            assert path is None or (path[0], path[-1]) == (o, d)
+
+    # Solo valores canónicos: tuplas de ids CSR
+    assert all(path is None or all(isinstance(i, int) for i in path)
+               for path, _ in (value for value, _ in sim.route_cache._lru._data.values()))
+    assert sim.route_cache.stats()["hits"] > 0
+
+
+def test_cache_requires_graph_events():
+    graph, sim = generar_red(10, 20, 2, 2, 6, seed=1)
+    a, b = list(graph.vertices())[:2]
+    graph.remove_observer(sim.route_cache)
+    with pytest.raises(AssertionError):
+        sim.route_cache.get(a, b)
@@ -5,65 +5,88 @@
 
 import streamlit as st
 from visual.network_adapter import NetworkXAdapter
-from simulacion.init_simulation import generar_red
+from simulacion.init_simulation import generar_red, registrar_clientes, generar_ordenes
 from simulacion.simulation import Simulation
+from simulacion.engine import EventEngine
+from simulacion.persistence import load_scenario, save_scenario
 from visual.avl_visualizer import AVLVisualizer
 import random
 import pandas as pd
-from collections import deque
 import plotly.express as px
 import math
+from datetime import datetime
 from streamlit_folium import folium_static
 from visual.MAP.map_visualizer import generar_mapa  
-import networkx as nx 
 from visual.generator_report import generar_pdf
+from model.all_pairs import all_pairs
+from model.mst import minimum_spanning_tree
+from model.shortest_path import battery_constrained_path, shortest_path
+from model.spatial import distancia_km, spatial_index
+
+
+ORDENES_POR_PAGINA = 500
+
+
+def tabla_ordenes(sim, inicio, fin):
+    """
+    Filas inicio..fin de la tienda de órdenes para mostrar: columnas de
+    to_pandas() con fechas en hora local, la ruta como texto (solo para estas
+    filas) y un aviso en las órdenes aún no entregadas.
+    """
+    store = sim.order_store
+    vista = store.to_pandas().iloc[inicio:fin].drop(columns=["path_start", "path_end"])
+    zona = datetime.now().astimezone().tzinfo
+    for columna in ("created_at", "delivered_at"):
+        vista[columna] = vista[columna].dt.tz_convert(zona).dt.tz_localize(None)
+    vista["delivered_at"] = vista["delivered_at"].dt.strftime("%Y-%m-%d %H:%M:%S") \
+        .fillna("Aún no se completó el envío")
+    vista.insert(1, "client", "Cliente" + vista["client_id"].astype(str).str[-1])
+    vista["path"] = [sim.route_table.label(tuple(store.path_ids_of(fila).tolist()))
+                     for fila in range(inicio, fin)]
+    return vista
 
 
 def calcular_mst(graph):
-    import networkx as nx  # por si está afuera
-
-    G = nx.Graph()
-    
-    for v in graph.vertices():
-        G.add_node(str(v))
-    
-    for e in graph.edges():
-        u, v = e.endpoints()
-        peso = e.element()
-        G.add_edge(str(u), str(v), weight=peso)
-
-    mst = nx.minimum_spanning_tree(G, algorithm="kruskal")
-    mst_edges = [(u, v, mst[u][v]["weight"]) for u, v in mst.edges()]
-    return mst_edges
-
-
-def calcular_ruta_optima(graph, origen, destino, algoritmo="Dijkstra", max_autonomia=50):
-    import networkx as nx
-    G = nx.DiGraph()
-
-    for v in graph.vertices():
-        G.add_node(str(v))
-
-    for e in graph.edges():
-        u, v = e.endpoints()
-        G.add_edge(str(u), str(v), weight=e.element())
-
+    # MST mantenido por los eventos del grafo: solo se arma con Kruskal la primera vez
+    mst = minimum_spanning_tree(graph)
+    return [(str(u), str(v), w) for u, v, w in mst.edges()]
+
+
+def calcular_ruta_optima(graph, origen, destino, algoritmo="Dijkstra", max_autonomia=50, cache=None):
+    # La caché guarda la ruta como ids CSR (igual que route_orders); aquí se
+    # traduce a etiquetas solo para mostrarla
+    if cache is not None:
+        cacheada = cache.get(origen, destino, algoritmo, max_autonomia)
+        if cacheada is None:
+            path, cost = ruta_optima(graph, origen, destino, algoritmo, max_autonomia)
+            index = graph.freeze().index
+            cacheada = (tuple(index[v] for v in path) if path else None, cost)
+            cache.set(origen, destino, cacheada, algoritmo, max_autonomia)
+        ids, cost = cacheada
+        vertices = graph.freeze().vertices
+        return ([str(vertices[i]) for i in ids] if ids else None), cost
+
+    path, cost = ruta_optima(graph, origen, destino, algoritmo, max_autonomia)
+    return ([str(v) for v in path] if path else None), cost
+
+
+def ruta_optima(graph, origen, destino, algoritmo="Dijkstra", max_autonomia=50):
+    # Ruta como lista de vértices, o (None, None). Los tres algoritmos usan
+    # el motor propio sobre la instantánea CSR
     def calcular_camino(source, target):
         try:
             if algoritmo == "Dijkstra":
-                path = nx.dijkstra_path(G, str(source), str(target), weight="weight")
-                cost = nx.dijkstra_path_length(G, str(source), str(target), weight="weight")
+                path, cost = shortest_path(graph, source, target, "dijkstra")
+            elif algoritmo == "A*":
+                # Heurística: distancia en línea recta hasta el destino
+                path, cost = shortest_path(graph, source, target, "astar", heuristic=distancia_km)
             elif algoritmo == "Floyd-Warshall":
-                pred, dist = nx.floyd_warshall_predecessor_and_distance(G, weight="weight")
-                path = []
-                current = str(target)
-                while current != str(source):
-                    path.insert(0, current)
-                    current = pred[str(source)][current]
-                path.insert(0, str(source))
-                cost = dist[str(source)][str(target)]
+                # Matrices calculadas una vez por versión del grafo
+                path, cost = all_pairs(graph).route(source, target)
             else:
                 return None, None
+            if path is None:
+                return None, None
             return path, cost
         except:
             return None, None
@@ -73,15 +96,11 @@ def calcular_ruta_optima(graph, origen, destino, algoritmo="Dijkstra", max_auton
     if path and cost <= max_autonomia:
         return path, cost
 
-    # Si supera autonomía, buscar vía recarga
-    recargas = [v for v in graph.vertices() if str(v).startswith("🔋")]
-    for nodo_recarga in recargas:
-        tramo1, cost1 = calcular_camino(origen, nodo_recarga)
-        tramo2, cost2 = calcular_camino(nodo_recarga, destino)
-        if tramo1 and tramo2 and cost1 <= max_autonomia and cost2 <= max_autonomia:
-            nueva_ruta = tramo1[:-1] + tramo2  # evitar repetir nodo recarga
-            nuevo_costo = cost1 + cost2
-            return nueva_ruta, nuevo_costo
+    # Si supera autonomía: una sola búsqueda sobre (nodo, batería) con recargas
+    recargas = graph.vertices_by_role("recarga")
+    path, cost = battery_constrained_path(graph, origen, destino, max_autonomia, recargas)
+    if path:
+        return path, cost
 
     # No se encontró ruta válida
     return None, None
@@ -128,37 +147,9 @@ with tabs[0]:
         st.session_state["sim"] = sim
 
 
-        # Registrar clientes automáticamente
-        for i in range(n_clientes):
-            client_id = f"C{i:03}"
-            name = f"Cliente {i}"
-            client_type = random.choice(["premium", "normal"])
-            sim.register_client(client_id, name, client_type)
-
-        # Función para encontrar rutas válidas con BFS
-        def bfs(graph, start, end):
-            visited = set()
-            queue = deque([(start, [start], 0)])
-
-            while queue:
-                current, path, cost = queue.popleft()
-                if current == end:
-                    return path, cost
-                for neighbor in graph.neighbors(current):
-                    if neighbor not in path:
-                        edge = graph.get_edge(current, neighbor)
-                        queue.append((neighbor, path + [neighbor], cost + edge.element()))
-            return None, None
-
-        vertices = list(graph.vertices())
-        client_nodes = [v for v in graph.vertices() if str(v).startswith("👤")]
-        if len(client_nodes) >= 2:
-            for i in range(n_orders):
-                origin = random.choice(client_nodes)
-                destination = random.choice([v for v in client_nodes if v != origin])
-                path, cost = bfs(graph, origin, destination)
-                if path:
-                    sim.create_order(f"C{i:03}", origin, destination, priority=1, path=path, cost=cost)
+        # Registrar clientes y generar órdenes automáticamente
+        registrar_clientes(sim, n_clientes)
+        generar_ordenes(sim, n_orders)
 
         st.session_state["graph"] = graph
         st.session_state["sim"] = sim
@@ -167,6 +158,31 @@ with tabs[0]:
 
         st.success("Simulación iniciada correctamente 🚀")
 
+    # 💾 Escenarios guardados: reabrir una red grande sin regenerarla ni rutearla
+    with st.expander("💾 Guardar / cargar escenario"):
+        carpeta = st.text_input("Carpeta del escenario", value="escenarios/actual")
+        col_guardar, col_cargar = st.columns(2)
+        with col_guardar:
+            if st.button("💾 Guardar escenario", disabled="sim" not in st.session_state):
+                info = save_scenario(st.session_state["sim"], carpeta)
+                st.success(f"Guardado: {info['vertices']} nodos, {info['orders']} órdenes")
+        with col_cargar:
+            if st.button("📂 Cargar escenario"):
+                try:
+                    graph, sim = load_scenario(carpeta)
+                except FileNotFoundError:
+                    st.error(f"No hay un escenario guardado en {carpeta}")
+                else:
+                    st.session_state["graph"] = graph
+                    st.session_state["sim"] = sim
+                    st.session_state["simulation_started"] = True
+                    st.session_state["adapter"] = NetworkXAdapter(graph)
+                    # La vista de la red se rearma para el grafo cargado
+                    for clave in ("nodos", "aristas", "ruta", "ruta_costo", "mst_resultado"):
+                        st.session_state.pop(clave, None)
+                    st.success(f"Escenario cargado: {graph.freeze().num_vertices()} nodos, "
+                               f"{len(sim.order_store)} órdenes")
+
 # =============================
 # 🌍 PESTAÑA 2: Explore Network
 # =============================
@@ -186,9 +202,8 @@ with tabs[1]:
             for v in graph.vertices():
                 label = str(v)
                 tipo = label[0]
-                lat = -38.735 + random.uniform(-0.01, 0.01)
-                lon = -72.590 + random.uniform(-0.01, 0.01)
-                nodos.append((label, lat, lon, tipo))
+                nodo = v.element()
+                nodos.append((label, nodo.lat, nodo.lon, tipo))
 
             for e in graph.edges():
                 u, v = e.endpoints()
@@ -202,21 +217,38 @@ with tabs[1]:
 
         st.subheader("✈ Calcular Ruta entre Nodos")
 
-        origenes = [v for v in graph.vertices() if str(v).startswith("📦")]
-        destinos = [v for v in graph.vertices() if str(v).startswith("👤")]
+        origenes = list(graph.vertices_by_role("almacen"))
+        destinos = list(graph.vertices_by_role("cliente"))
 
-        origen = st.selectbox("📦 Nodo de Origen (Almacenamiento)", origenes, format_func=str)
+        auto_almacen = st.checkbox("📦 Asignar automáticamente el almacén más cercano")
         destino = st.selectbox("👤 Nodo de Destino (Cliente)", destinos, format_func=str)
+        if not origenes or not destinos:
+            origen = None
+            st.warning("La red no tiene almacenes o clientes: no hay rutas que calcular.")
+        elif auto_almacen:
+            # Asignación precalculada con un Dijkstra multi-origen por versión del grafo
+            origen, costo_almacen = sim.nearest_warehouse(destino)
+            if origen is None:
+                st.warning("Ningún almacén alcanza a este cliente.")
+                origen = origenes[0]
+            else:
+                st.info(f"Almacén asignado: {origen} (costo {round(costo_almacen, 2)} km)")
+        else:
+            origen = st.selectbox("📦 Nodo de Origen (Almacenamiento)", origenes, format_func=str)
+
+        almacen, km = spatial_index(graph).nearest_to(destino, "almacen") if destino is not None else (None, None)
+        if almacen is not None:
+            st.caption(f"Almacén más cercano a {destino} en línea recta: {almacen} ({round(km, 2)} km)")
 
-        algoritmo = st.radio("⚙️ Algoritmo de Ruta", ["Dijkstra", "Floyd-Warshall"])
+        algoritmo = st.radio("⚙️ Algoritmo de Ruta", ["Dijkstra", "A*", "Floyd-Warshall"])
 
-        if st.button("✈ Calcular Ruta"):
-            path, cost = calcular_ruta_optima(graph, origen, destino, algoritmo)
+        if origen is not None and st.button("✈ Calcular Ruta"):
+            path, cost = calcular_ruta_optima(graph, origen, destino, algoritmo, cache=sim.route_cache)
             if path:
                 st.session_state["ruta"] = path
                 st.session_state["ruta_costo"] = cost
                 ruta = path
-                st.success(f"Ruta con {algoritmo}: {' → '.join(ruta)} | Costo total: {cost}")
+                st.success(f"Ruta con {algoritmo}: {' → '.join(ruta)} | Costo total: {round(cost, 2)} km")
 
                 recarga_en_ruta = any("🔋" in n for n in ruta)
                 tiempo_estimado = round(cost * 1.2, 2)
@@ -224,12 +256,35 @@ with tabs[1]:
                 with st.expander("📝 Resumen de vuelo"):
                     st.markdown(f"**Nodos visitados:** {len(ruta)}")
                     st.markdown(f"**Ruta completa:** {' → '.join(ruta)}")
-                    st.markdown(f"**Distancia total:** {cost} unidades")
+                    st.markdown(f"**Distancia total:** {round(cost, 2)} km")
                     st.markdown(f"**Tiempo estimado de vuelo:** {tiempo_estimado} minutos")
                     st.markdown(f"**Recarga necesaria:** {'✅ Sí' if recarga_en_ruta else '❌ No'}")
             else:
                 st.error("No se encontró una ruta válida entre esos nodos.")
 
+            stats = sim.route_cache.stats()
+            st.caption(f"Caché de rutas: {stats['hits']} aciertos · {stats['misses']} fallos · "
+                       f"{stats['evictions']} desalojos · {stats['invalidations']} invalidaciones")
+
+        with st.expander("🌬️ Viento / congestión: ajustar el costo de un tramo"):
+            # Orden estable por extremos: no cambia cuando se edita un peso
+            aristas_grafo = sorted(graph.edges(), key=lambda e: tuple(map(str, e.endpoints())))
+            arista = st.selectbox("Tramo", aristas_grafo, format_func=str)
+            # Nunca menos que la línea recta: así A* sigue dando la ruta óptima
+            peso_minimo = max(math.ceil(distancia_km(*arista.endpoints()) * 100) / 100, 0.01)
+            nuevo_peso = st.number_input("Nuevo costo (km equivalentes)", min_value=peso_minimo,
+                                         value=max(float(arista.element()), peso_minimo), step=0.5)
+            if st.button("🌬️ Aplicar"):
+                # Solo se reparan las rutas y matrices afectadas, sin recalcular todo
+                u, v = arista.endpoints()
+                graph.update_edge_weight(u, v, nuevo_peso)
+                st.session_state["aristas"] = [
+                    (str(a), str(b), e.element()) for e in graph.edges() for a, b in [e.endpoints()]
+                ]
+                stats = sim.route_cache.stats()
+                st.success(f"Costo de {u} → {v} actualizado. Rutas desalojadas de la caché: "
+                           f"{stats['selective_evictions']} en total.")
+
         st.subheader("🌲 Árbol de Expansión Mínima (Kruskal)")
 
         col1, col2 = st.columns(2)
@@ -282,14 +337,25 @@ with tabs[2]:
         else:
             st.info("No hay clientes registrados todavía.")
 
+        st.subheader("🚁 Simular entregas")
+        n_drones = st.number_input("Drones en la flota", min_value=1, max_value=100, value=5)
+        if st.button("🚁 Entregar órdenes pendientes"):
+            # Motor de eventos discretos: las órdenes llegan juntas y se despachan por prioridad
+            engine = EventEngine(sim, n_drones=int(n_drones))
+            engine.submit_all(o for o in sim.orders.values() if o.status == "pending")
+            resultado = engine.run()
+            st.success(f"{resultado['delivered']} órdenes entregadas en {resultado['minutes']} minutos simulados "
+                       f"({resultado['events']} eventos)")
+
         st.subheader("📦 Orders")
-        orders = sim.get_orders()
-        if orders:
-            # Ajustar visualización del campo delivered_at
-            for order in orders:
-                if order["delivered_at"] in [None, "null", "", "None"]:
-                    order["delivered_at"] = "Aún no se completó el envío"
-            st.dataframe(pd.DataFrame(orders))
+        total = len(sim.order_store)
+        if total:
+            # Se arma solo la página visible: las rutas como texto no se generan para todas
+            paginas = math.ceil(total / ORDENES_POR_PAGINA)
+            pagina = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, value=1) \
+                if paginas > 1 else 1
+            inicio = (int(pagina) - 1) * ORDENES_POR_PAGINA
+            st.dataframe(tabla_ordenes(sim, inicio, min(inicio + ORDENES_POR_PAGINA, total)))
         else:
             st.info("No hay órdenes registradas todavía.")
     else:
@@ -305,33 +371,49 @@ with tabs[3]:
 
     if "sim" in st.session_state:
         sim = st.session_state["sim"]
-        rutas = sim.get_frequent_routes()
+        rutas = sim.get_top_routes(10)
 
         if rutas:
-            rutas.sort()  # Ordenar por recorrido (orden lexicográfico)
-
             st.subheader("📋 Rutas más frecuentes")
             for i, (ruta, freq) in enumerate(rutas, start=1):
                 st.markdown(f"{i}. Route hash: {ruta} | Frequency: {freq}")
 
             st.subheader("📊 AVL Tree Visualization")
             from visual.avl_visualizer import AVLVisualizer
-            visualizer = AVLVisualizer(sim.routes_avl)
+            visualizer = AVLVisualizer(sim.routes_avl, formatter=sim.route_table.label)
             visualizer.draw(use_hierarchy=True)
 
+            st.subheader("🚁 Agrupar órdenes en vuelos")
+            autonomia = st.slider("Autonomía del dron (km)", min_value=5, max_value=100, value=50)
+            if st.button("🚁 Planificar vuelos"):
+                # Ahorros de Clarke-Wright + 2-opt sobre las distancias de Floyd-Warshall
+                plan = sim.plan_tours(capacity=autonomia)
+                resumen = plan.summary()
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Vuelos", resumen["flights"], delta=resumen["flights"] - resumen["baseline_flights"],
+                            delta_color="inverse")
+                col2.metric("Distancia total (km)", resumen["distance"],
+                            delta=round(resumen["distance"] - resumen["baseline_distance"], 2), delta_color="inverse")
+                col3.metric("Órdenes por vuelo", resumen["orders_per_flight"])
+                st.caption(f"Sin agrupar: {resumen['baseline_flights']} vuelos y {resumen['baseline_distance']} km "
+                           f"({resumen['distance_saved_pct']}% de distancia ahorrada)")
+                with st.expander("📝 Detalle de vuelos"):
+                    for tour in plan.tours:
+                        st.markdown(f"- {tour} · {len(tour.orders)} órdenes")
+
             st.subheader("📄 Generar Informe PDF")
 
             if st.button("📄 Generar Informe"):
-                orders = sim.get_orders()
+                orders = sim.order_store  # admite len() y [:5] sin materializar todas las órdenes
                 clients = sim.get_clients()
-                rutas_frecuentes = sim.get_frequent_routes()
+                rutas_frecuentes = sim.get_top_routes(5)
 
                 from generator_report import generar_pdf, guardar_graficos_pdf
                 graph = st.session_state["graph"]
                 
                 guardar_graficos_pdf(graph, sim)  # 💾 genera los .png antes del PDF
 
-                ruta_pdf = generar_pdf(orders, clients, rutas_frecuentes)
+                ruta_pdf = generar_pdf(orders, clients, rutas_frecuentes, total_rutas=len(sim.routes_avl))
                 with open(ruta_pdf, "rb") as file:
                     st.download_button("⬇️ Descargar Informe PDF", file, file_name="informe_drones.pdf")
 
@@ -359,23 +441,11 @@ with tabs[4]:
 
     if graph and sim:
         roles = {"📦": "Storage", "🔋": "Recharge", "👤": "Client"}
-        role_counts = {"📦": 0, "🔋": 0, "👤": 0}
-        visit_counts = {"📦": {}, "🔋": {}, "👤": {}}
-
-        for v in graph.vertices():
-            name = str(v)
-            for symbol in roles:
-                if name.startswith(symbol):
-                    role_counts[symbol] += 1
-                    visit_counts[symbol][name] = 0
-
-        # Simulación: contar visitas reales por nodo en las rutas
-        for order in sim.get_orders():
-            for node in order.get("path", []):
-                node_str = str(node)
-                for symbol in visit_counts:
-                    if node_str in visit_counts[symbol]:
-                        visit_counts[symbol][node_str] += 1
+        simbolos = {"📦": "almacen", "🔋": "recarga", "👤": "cliente"}
+
+        # Agregados mantenidos por sim.analytics en cada orden: lectura O(k)
+        conteo_roles = sim.analytics.role_counts()
+        role_counts = {symbol: conteo_roles.get(role, 0) for symbol, role in simbolos.items()}
 
         labels = [roles[k] for k in role_counts]
         sizes = [int(role_counts[k]) if role_counts[k] and not math.isnan(role_counts[k]) else 0 for k in role_counts]
@@ -387,7 +457,7 @@ with tabs[4]:
             cols = {"👤": col1, "🔋": col2, "📦": col3}
 
             for symbol in ["👤", "🔋", "📦"]:
-                sorted_visits = sorted(visit_counts[symbol].items(), key=lambda x: x[1], reverse=True)[:5]
+                sorted_visits = [(str(v), c) for v, c in sim.analytics.top_visited(simbolos[symbol], 5)]
                 if sorted_visits:
                     df_bar = pd.DataFrame(sorted_visits, columns=["Nodo", "Visitas"])
                     fig = px.bar(
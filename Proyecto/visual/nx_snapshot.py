@@ -0,0 +1,70 @@
+# visual/nx_snapshot.py
+
+import weakref
+
+import networkx as nx
+
+
+class NetworkXSnapshot:
+    """
+    Copia NetworkX de un Graph compartida por el dashboard y NetworkXAdapter.
+    Se registra como observador del grafo, así cada insert/remove se aplica
+    de forma incremental en vez de reconstruir la copia en cada consulta.
+    Los nodos son los mismos Vertex del grafo, con atributos label y role.
+    """
+
+    def __init__(self, graph):
+        self.grafo = nx.DiGraph() if graph.is_directed() else nx.Graph()
+        self.version = graph.version()
+        for v in graph.vertices():
+            self._agregar_nodo(v)
+        for e in graph.edges():
+            self._agregar_arista(e)
+        graph.add_observer(self)
+
+    def _agregar_nodo(self, v):
+        e = v.element()
+        self.grafo.add_node(v, label=getattr(e, "label", str(e)), role=getattr(e, "role", None))
+
+    def _agregar_arista(self, e):
+        u, v = e.endpoints()
+        self.grafo.add_edge(u, v, weight=e.element())
+
+    # ----- Eventos del grafo -----
+    def vertex_inserted(self, graph, v):
+        self._agregar_nodo(v)
+        self.version = graph.version()
+
+    def vertex_removed(self, graph, v):
+        if v in self.grafo:
+            self.grafo.remove_node(v)
+        self.version = graph.version()
+
+    def edge_inserted(self, graph, e):
+        self._agregar_arista(e)
+        self.version = graph.version()
+
+    def edge_removed(self, graph, e):
+        u, v = e.endpoints()
+        if self.grafo.has_edge(u, v):
+            self.grafo.remove_edge(u, v)
+        self.version = graph.version()
+
+    def edge_weight_updated(self, graph, e, old):
+        u, v = e.endpoints()
+        self.grafo[u][v]["weight"] = e.element()
+        self.version = graph.version()
+
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def nx_snapshot(graph):
+    """Devuelve la copia NetworkX del grafo, creándola solo la primera vez."""
+    snapshot = _cache.get(graph)
+    if snapshot is None or snapshot.version != graph.version():
+        if snapshot is not None:
+            graph.remove_observer(snapshot)
+        snapshot = NetworkXSnapshot(graph)
+        _cache[graph] = snapshot
+    return snapshot